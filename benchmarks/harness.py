@@ -0,0 +1,147 @@
+import json
+import statistics
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from utilities.instrumentation import REGISTRY, MetricsRegistry
+
+TIME_TOLERANCE = 1.0
+MEMORY_TOLERANCE = 0.1
+BYTES_TOLERANCE = 0.05
+# Timing changes smaller than this are treated as noise whatever the ratio.
+MIN_TIME_DELTA = 0.001
+# Metrics that do not depend on the machine or its load, so they are safe to
+# gate a build on against a baseline recorded anywhere.
+DETERMINISTIC_METRICS = ("peak_memory_bytes", "bytes_transferred")
+
+
+@dataclass
+class BenchmarkResult:
+    """
+    Measurements for a single benchmark case.
+
+    Attributes:
+        name (str): The unique case name, including its parameters.
+        seconds (float): The median wall time over all repeats.
+        peak_memory_bytes (int): The peak Python allocation during one run.
+        bytes_transferred (int): The AWS request and response payload bytes.
+        params (Dict[str, Any]): The parameters of the case.
+    """
+
+    name: str
+    seconds: float
+    peak_memory_bytes: int
+    bytes_transferred: int
+    params: Dict[str, Any] = field(default_factory=dict)
+
+
+def measure(
+    name: str,
+    fn: Callable[[], Any],
+    registry: MetricsRegistry = REGISTRY,
+    repeat: int = 7,
+    params: Optional[Dict[str, Any]] = None,
+) -> BenchmarkResult:
+    """
+    Times a callable and records its peak memory and AWS bytes transferred.
+
+    The function is first run once untraced to warm up one-time work such as
+    botocore's lazy loading, then once under ``tracemalloc`` to record memory
+    and bytes, then ``repeat`` more times untraced, keeping the median run.
+
+    Args:
+        name (str): The case name.
+        fn (Callable[[], Any]): The code under test.
+        registry (MetricsRegistry): The registry the instrumented clients record to.
+        repeat (int): The number of timed runs.
+        params (Optional[Dict[str, Any]]): The case parameters to record.
+
+    Returns:
+        BenchmarkResult: The measurements.
+    """
+    fn()
+    start_bytes = registry.total_bytes()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    transferred = registry.total_bytes() - start_bytes
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+
+    return BenchmarkResult(
+        name=name,
+        seconds=statistics.median(timings),
+        peak_memory_bytes=peak,
+        bytes_transferred=transferred,
+        params=params or {},
+    )
+
+
+def compare_to_baseline(
+    results: List[BenchmarkResult],
+    baseline: Dict[str, Dict[str, Any]],
+    time_tolerance: float = TIME_TOLERANCE,
+    memory_tolerance: float = MEMORY_TOLERANCE,
+    bytes_tolerance: float = BYTES_TOLERANCE,
+    metrics: Sequence[str] = DETERMINISTIC_METRICS,
+) -> List[str]:
+    """
+    Lists every metric that has grown beyond its tolerance since the baseline.
+
+    Only the deterministic metrics are checked by default, since wall time is
+    only comparable against a baseline recorded on the same machine. Cases that
+    are not in the baseline are ignored so new benchmarks can be added before
+    the baseline is refreshed.
+
+    Args:
+        results (List[BenchmarkResult]): The current measurements.
+        baseline (Dict[str, Dict[str, Any]]): The stored measurements by case name.
+        time_tolerance (float): The allowed relative increase in wall time.
+        memory_tolerance (float): The allowed relative increase in peak memory.
+        bytes_tolerance (float): The allowed relative increase in bytes transferred.
+        metrics (Sequence[str]): The metrics to check, any of ``seconds``,
+            ``peak_memory_bytes`` and ``bytes_transferred``.
+
+    Returns:
+        List[str]: A description of each regression, empty if there are none.
+    """
+    tolerances = {
+        "seconds": time_tolerance,
+        "peak_memory_bytes": memory_tolerance,
+        "bytes_transferred": bytes_tolerance,
+    }
+    regressions = []
+    for result in results:
+        previous = baseline.get(result.name)
+        if previous is None:
+            continue
+        for metric in metrics:
+            tolerance = tolerances[metric]
+            old, new = previous[metric], getattr(result, metric)
+            if metric == "seconds" and new - old < MIN_TIME_DELTA:
+                continue
+            if new > old * (1 + tolerance):
+                regressions.append(
+                    f"{result.name}: {metric} {old:.6g} -> {new:.6g} "
+                    f"(+{(new / old - 1) * 100 if old else float('inf'):.0f}%)"
+                )
+    return regressions
+
+
+def write_results(results: List[BenchmarkResult], path: str) -> None:
+    with open(path, "w") as f:
+        json.dump({r.name: asdict(r) for r in results}, f, indent=2, sort_keys=True)
+
+
+def read_results(path: str) -> Dict[str, Dict[str, Any]]:
+    with open(path, "r") as f:
+        return json.load(f)
@@ -0,0 +1,207 @@
+import argparse
+import os
+import sys
+from typing import List
+
+import numpy as np
+from moto import mock_aws
+from sklearn.linear_model import LinearRegression
+
+from benchmarks.harness import (
+    BYTES_TOLERANCE,
+    DETERMINISTIC_METRICS,
+    MEMORY_TOLERANCE,
+    TIME_TOLERANCE,
+    BenchmarkResult,
+    compare_to_baseline,
+    measure,
+    read_results,
+    write_results,
+)
+from utilities.schema_reader import GlueSchemaReader
+from utilities.version import ModelVersionManager
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+BUCKET = "benchmark-model-bucket"
+DATABASE = "benchmark-db"
+PARAM_NAME = "benchmark/model/version"
+
+CRAZY_TYPE = (
+    "array<struct<name:string,code:string,contacts:array<struct<personFamilyName:"
+    "string,personGivenName:string,personRoles:array<string>,personTitle:string,"
+    "jobs:array<string>>>,score:int>>"
+)
+TYPE_DEPTHS = [1, 4, 16]
+TYPE_WIDTHS = [4, 32, 128]
+SCHEMA_WIDTHS = [10, 100, 1000]
+MODEL_SIZES = [1_000, 100_000, 1_000_000]
+
+
+def nested_type(depth: int, width: int) -> str:
+    """
+    Builds a synthetic Glue type string of the given nesting depth, where every
+    struct has ``width`` fields.
+
+    Args:
+        depth (int): The number of nested array<struct<...>> levels.
+        width (int): The number of fields in each struct.
+
+    Returns:
+        str: The Glue type string.
+    """
+    if depth == 0:
+        return "string"
+    fields = [f"child:array<{nested_type(depth - 1, width)}>"]
+    fields += [f"f{i}:{'int' if i % 2 else 'string'}" for i in range(width - 1)]
+    return f"struct<{','.join(fields)}>"
+
+
+def bench_get_polars_type(quick: bool) -> List[BenchmarkResult]:
+    reader = GlueSchemaReader(DATABASE)
+    results = [
+        measure("get_polars_type[crazy]", lambda: reader.get_polars_type(CRAZY_TYPE))
+    ]
+    for depth in TYPE_DEPTHS[:2] if quick else TYPE_DEPTHS:
+        for width in TYPE_WIDTHS[:2] if quick else TYPE_WIDTHS:
+            type_str = nested_type(depth, width)
+            results.append(
+                measure(
+                    f"get_polars_type[depth={depth},width={width}]",
+                    lambda: reader.get_polars_type(type_str),
+                    params={"depth": depth, "width": width},
+                )
+            )
+    return results
+
+
+def bench_get_polars_schema(quick: bool) -> List[BenchmarkResult]:
+    reader = GlueSchemaReader(DATABASE)
+    reader.glue_client.create_database(DatabaseInput={"Name": DATABASE})
+    results = []
+    for n_columns in SCHEMA_WIDTHS[:2] if quick else SCHEMA_WIDTHS:
+        table = f"wide_{n_columns}"
+        columns = [
+            {"Name": f"col_{i}", "Type": ["int", "string", CRAZY_TYPE][i % 3]}
+            for i in range(n_columns)
+        ]
+        reader.glue_client.create_table(
+            DatabaseName=DATABASE,
+            TableInput={"Name": table, "StorageDescriptor": {"Columns": columns}},
+        )
+        results.append(
+            measure(
+                f"get_polars_schema[columns={n_columns}]",
+                lambda: reader.get_polars_schema(table),
+                params={"columns": n_columns},
+            )
+        )
+    return results
+
+
+def bench_model_round_trip(quick: bool) -> List[BenchmarkResult]:
+    manager = ModelVersionManager(BUCKET, "benchmark", PARAM_NAME)
+    manager.s3_client.create_bucket(
+        Bucket=BUCKET,
+        CreateBucketConfiguration={
+            "LocationConstraint": manager.s3_client.meta.region_name
+        },
+    )
+    results = []
+    for n_coef in MODEL_SIZES[:2] if quick else MODEL_SIZES:
+        model = LinearRegression()
+        model.coef_ = np.random.default_rng(0).normal(size=n_coef)
+        model.intercept_ = 0.0
+        version = f"{n_coef}.0.0"
+        repeat = 3 if n_coef >= 1_000_000 else 5
+        results.append(
+            measure(
+                f"save_model[coefficients={n_coef}]",
+                lambda: manager.save_model(model, version),
+                repeat=repeat,
+                params={"coefficients": n_coef},
+            )
+        )
+        results.append(
+            measure(
+                f"load_model[coefficients={n_coef}]",
+                lambda: manager.load_model(version),
+                repeat=repeat,
+                params={"coefficients": n_coef},
+            )
+        )
+    return results
+
+
+def run_suite(quick: bool = False) -> List[BenchmarkResult]:
+    """
+    Runs every benchmark against moto stand-ins for Glue, SSM and S3.
+
+    Args:
+        quick (bool): Only run the smaller parameter sizes.
+
+    Returns:
+        List[BenchmarkResult]: The measurements of every case.
+    """
+    for key in ("AWS_ACCESS_KEY_ID", "AWS_SECRET_ACCESS_KEY"):
+        os.environ.setdefault(key, "testing")
+    with mock_aws():
+        results = bench_get_polars_type(quick)
+        results += bench_get_polars_schema(quick)
+        results += bench_model_round_trip(quick)
+    return results
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the utilities package.")
+    parser.add_argument("--output", default="bench_output.json")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--quick", action="store_true")
+    parser.add_argument(
+        "--gate-time",
+        action="store_true",
+        help="Fail on wall-time regressions instead of only warning about them. "
+        "Only meaningful when the baseline was recorded on the same machine.",
+    )
+    parser.add_argument("--time-tolerance", type=float, default=TIME_TOLERANCE)
+    parser.add_argument("--memory-tolerance", type=float, default=MEMORY_TOLERANCE)
+    parser.add_argument("--bytes-tolerance", type=float, default=BYTES_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    results = run_suite(quick=args.quick)
+    for result in results:
+        print(
+            f"{result.name:<50} {result.seconds * 1000:>10.3f} ms "
+            f"{result.peak_memory_bytes / 1024:>10.1f} KiB "
+            f"{result.bytes_transferred:>10} B"
+        )
+    write_results(results, args.output)
+
+    if args.update_baseline:
+        write_results(results, args.baseline)
+        print(f"Baseline updated at {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"No baseline found at {args.baseline}, skipping comparison.")
+        return 0
+
+    baseline = read_results(args.baseline)
+    tolerances = {
+        "time_tolerance": args.time_tolerance,
+        "memory_tolerance": args.memory_tolerance,
+        "bytes_tolerance": args.bytes_tolerance,
+    }
+    gated = DETERMINISTIC_METRICS + (("seconds",) if args.gate_time else ())
+    regressions = compare_to_baseline(results, baseline, metrics=gated, **tolerances)
+    if not args.gate_time:
+        for slowdown in compare_to_baseline(
+            results, baseline, metrics=("seconds",), **tolerances
+        ):
+            print(f"WARNING {slowdown} (wall time is not gated)")
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,8 @@
 import pytest
 import os
+import urllib.request
 from moto import mock_aws
+from moto.server import ThreadedMotoServer
 import boto3
 
 
@@ -23,6 +25,30 @@ def mocked_aws(aws_credentials):
         yield
 
 
+@pytest.fixture(scope="session")
+def moto_server(aws_credentials):
+    """
+    Standalone moto server, for code that talks to AWS over real HTTP from
+    other threads.
+    """
+    server = ThreadedMotoServer(port=0, verbose=False)
+    server.start()
+    _, port = server.get_host_and_port()
+    yield f"http://127.0.0.1:{port}"
+    server.stop()
+
+
+@pytest.fixture
+def moto_endpoint(moto_server, monkeypatch):
+    """
+    Points boto3 at the moto server, with its state reset for each test.
+    """
+    reset = urllib.request.Request(f"{moto_server}/moto-api/reset", method="POST")
+    urllib.request.urlopen(reset).close()
+    monkeypatch.setenv("AWS_ENDPOINT_URL", moto_server)
+    yield moto_server
+
+
 @pytest.fixture
 def s3_client(mocked_aws):
     """Mocked AWS S3 Client for moto."""
@@ -14,16 +14,20 @@
 import requests
 from datetime import datetime
 import getopt, sys
+import time
 import urllib3
 import boto3
 import json
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+METADATA_PATH = "/opt/ml/metadata/resource-metadata.json"
+REQUEST_TIMEOUT = 10
+
 # Usage
 usageInfo = """Usage:
 This scripts checks if a notebook is idle for X seconds if it does, it'll stop the notebook:
-python autostop.py --time <time_in_seconds> [--port <jupyter_port>] [--ignore-connections]
+python autostop.py --time <time_in_seconds> [--port <jupyter_port>] [--ignore-connections] [--daemon [--interval <seconds>]]
 Type "python autostop.py -h" for available options.
 """
 # Help info
@@ -33,46 +37,73 @@ helpInfo = """-t, --time
     jupyter port
 -c --ignore-connections
     Stop notebook once idle, ignore connected users
+-d, --daemon
+    Keep running and check for idleness every interval, instead of checking once
+-i, --interval
+    Seconds between checks in daemon mode (default 60)
+--url
+    Base URL of the Jupyter server, overrides --port
 -h, --help
     Help information
 """
 
-# Read in command-line parameters
-idle = True
-port = "8443"
-ignore_connections = False
-try:
-    opts, args = getopt.getopt(
-        sys.argv[1:], "ht:p:c", ["help", "time=", "port=", "ignore-connections"]
-    )
-    if len(opts) == 0:
-        raise getopt.GetoptError("No input parameters!")
-    for opt, arg in opts:
-        if opt in ("-h", "--help"):
-            print(helpInfo)
-            exit(0)
-        if opt in ("-t", "--time"):
-            time = int(arg)
-        if opt in ("-p", "--port"):
-            port = str(arg)
-        if opt in ("-c", "--ignore-connections"):
-            ignore_connections = True
-except getopt.GetoptError:
-    print(usageInfo)
-    exit(1)
-
-# Missing configuration notification
-missingConfiguration = False
-if not time:
-    print("Missing '-t' or '--time'")
-    missingConfiguration = True
-if missingConfiguration:
-    exit(2)
-
-
-def is_idle(last_activity):
+
+def parse_args(argv):
+    """Reads the command-line parameters, exiting on invalid input."""
+    options = {
+        "time": None,
+        "port": "8443",
+        "ignore_connections": False,
+        "daemon": False,
+        "interval": 60,
+        "url": None,
+    }
+    try:
+        opts, args = getopt.getopt(
+            argv,
+            "ht:p:cdi:",
+            [
+                "help",
+                "time=",
+                "port=",
+                "ignore-connections",
+                "daemon",
+                "interval=",
+                "url=",
+            ],
+        )
+        if len(opts) == 0:
+            raise getopt.GetoptError("No input parameters!")
+        for opt, arg in opts:
+            if opt in ("-h", "--help"):
+                print(helpInfo)
+                exit(0)
+            if opt in ("-t", "--time"):
+                options["time"] = int(arg)
+            if opt in ("-p", "--port"):
+                options["port"] = str(arg)
+            if opt in ("-c", "--ignore-connections"):
+                options["ignore_connections"] = True
+            if opt in ("-d", "--daemon"):
+                options["daemon"] = True
+            if opt in ("-i", "--interval"):
+                options["interval"] = int(arg)
+            if opt == "--url":
+                options["url"] = arg
+    except getopt.GetoptError:
+        print(usageInfo)
+        exit(1)
+
+    # Missing configuration notification
+    if not options["time"]:
+        print("Missing '-t' or '--time'")
+        exit(2)
+    return options
+
+
+def is_idle(last_activity, idle_time):
     last_activity = datetime.strptime(last_activity, "%Y-%m-%dT%H:%M:%S.%fz")
-    if (datetime.now() - last_activity).total_seconds() > time:
+    if (datetime.now() - last_activity).total_seconds() > idle_time:
         print("Notebook is idle. Last activity time = ", last_activity)
         return True
     else:
@@ -80,24 +111,16 @@ def is_idle(last_activity):
         return False
 
 
-def get_notebook_name():
-    log_path = "/opt/ml/metadata/resource-metadata.json"
-    with open(log_path, "r") as logs:
-        _logs = json.load(logs)
-    return _logs["ResourceName"]
-
-
-# This is hitting Jupyter's sessions API: https://github.com/jupyter/jupyter/wiki/Jupyter-Notebook-Server-API#Sessions-API
-response = requests.get("https://localhost:" + port + "/api/sessions", verify=False)
-data = response.json()
-if len(data) > 0:
+def sessions_are_idle(data, idle_time, ignore_connections):
+    """Applies the idle rules to a non-empty response from the sessions API."""
+    idle = True
     for notebook in data:
         # Idleness is defined by Jupyter
         # https://github.com/jupyter/notebook/issues/4634
         if notebook["kernel"]["execution_state"] == "idle":
             if not ignore_connections:
                 if notebook["kernel"]["connections"] == 0:
-                    if not is_idle(notebook["kernel"]["last_activity"]):
+                    if not is_idle(notebook["kernel"]["last_activity"], idle_time):
                         idle = False
                 else:
                     idle = False
@@ -106,7 +129,7 @@ if len(data) > 0:
                         % idle
                     )
             else:
-                if not is_idle(notebook["kernel"]["last_activity"]):
+                if not is_idle(notebook["kernel"]["last_activity"], idle_time):
                     idle = False
                     print(
                         "Notebook idle state set as %s since kernel connections are ignored."
@@ -115,18 +138,113 @@ if len(data) > 0:
         else:
             print("Notebook is not idle:", notebook["kernel"]["execution_state"])
             idle = False
-else:
-    client = boto3.client("sagemaker")
-    uptime = client.describe_notebook_instance(
-        NotebookInstanceName=get_notebook_name()
-    )["LastModifiedTime"]
-    if not is_idle(uptime.strftime("%Y-%m-%dT%H:%M:%S.%fz")):
-        idle = False
-        print("Notebook idle state set as %s since no sessions detected." % idle)
-
-if idle:
-    print("Closing idle notebook")
-    client = boto3.client("sagemaker")
-    client.stop_notebook_instance(NotebookInstanceName=get_notebook_name())
-else:
-    print("Notebook not idle. Pass.")
+    return idle
+
+
+def get_notebook_name():
+    with open(METADATA_PATH, "r") as logs:
+        _logs = json.load(logs)
+    return _logs["ResourceName"]
+
+
+class AutostopChecker:
+    """
+    Checks whether the notebook instance is idle and stops it if so.
+
+    The HTTP session to Jupyter, the SageMaker client and the notebook name are
+    created once and reused, so repeated checks in daemon mode only cost one
+    keep-alive request to the sessions API.
+    """
+
+    def __init__(
+        self,
+        idle_time,
+        port="8443",
+        ignore_connections=False,
+        url=None,
+        sagemaker_client=None,
+        notebook_name=None,
+    ):
+        self.idle_time = idle_time
+        self.ignore_connections = ignore_connections
+        self.base_url = url or "https://localhost:" + port
+        self.session = requests.Session()
+        self.session.verify = False
+        self._sagemaker_client = sagemaker_client
+        self._notebook_name = notebook_name
+
+    @property
+    def sagemaker_client(self):
+        if self._sagemaker_client is None:
+            self._sagemaker_client = boto3.client("sagemaker")
+        return self._sagemaker_client
+
+    @property
+    def notebook_name(self):
+        if self._notebook_name is None:
+            self._notebook_name = get_notebook_name()
+        return self._notebook_name
+
+    def check(self):
+        """Returns True if the notebook instance is idle."""
+        # This is hitting Jupyter's sessions API: https://github.com/jupyter/jupyter/wiki/Jupyter-Notebook-Server-API#Sessions-API
+        response = self.session.get(
+            self.base_url + "/api/sessions", timeout=REQUEST_TIMEOUT
+        )
+        data = response.json()
+        if len(data) > 0:
+            return sessions_are_idle(data, self.idle_time, self.ignore_connections)
+
+        uptime = self.sagemaker_client.describe_notebook_instance(
+            NotebookInstanceName=self.notebook_name
+        )["LastModifiedTime"]
+        if not is_idle(uptime.strftime("%Y-%m-%dT%H:%M:%S.%fz"), self.idle_time):
+            print("Notebook idle state set as %s since no sessions detected." % False)
+            return False
+        return True
+
+    def run_once(self):
+        """Checks once and stops the notebook if idle, returning whether it stopped."""
+        if self.check():
+            print("Closing idle notebook")
+            self.sagemaker_client.stop_notebook_instance(
+                NotebookInstanceName=self.notebook_name
+            )
+            return True
+        print("Notebook not idle. Pass.")
+        return False
+
+    def run_forever(self, interval, sleep=time.sleep):
+        """
+        Checks every interval seconds until the notebook has been stopped.
+
+        Nothing restarts the daemon if it exits, so an error in one check is
+        logged and the next check still runs; it only returns after a stop.
+        """
+        while True:
+            try:
+                if self.run_once():
+                    return
+            except requests.RequestException as e:
+                print("Could not reach the Jupyter sessions API:", e)
+            except Exception as e:
+                print("Autostop check failed, retrying next interval:", repr(e))
+            sleep(interval)
+
+
+def main(argv):
+    options = parse_args(argv)
+    checker = AutostopChecker(
+        options["time"],
+        port=options["port"],
+        ignore_connections=options["ignore_connections"],
+        url=options["url"],
+    )
+    if options["daemon"]:
+        checker.run_forever(options["interval"])
+    else:
+        checker.run_once()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
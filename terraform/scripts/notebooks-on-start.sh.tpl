@@ -36,6 +36,7 @@ EOF
 set -ex
 # OVERVIEW
 # This script stops a SageMaker notebook once it's idle for more than 1 hour (default time)
+# The check runs as a long-lived background daemon, polling Jupyter every CHECK_INTERVAL seconds.
 # You can change the idle time for stop using the environment variable below.
 # If you want the notebook the stop only if no browsers are open, remove the --ignore-connections flag
 #
@@ -47,6 +48,7 @@ set -ex
 
 # PARAMETERS
 IDLE_TIME=3600
+CHECK_INTERVAL=60
 
 echo "Fetching the autostop script"
 aws s3 cp "s3://${bucket}/scripts/python/${env}/autostop.py" .
@@ -69,9 +71,12 @@ fi
 echo "Found boto3 at $PYTHON_DIR"
 
 
-echo "Starting the SageMaker autostop script in cron"
+echo "Starting the SageMaker autostop daemon"
 
-(crontab -l 2>/dev/null; echo "*/5 * * * * $PYTHON_DIR $PWD/autostop.py --time $IDLE_TIME --ignore-connections >> /var/log/jupyter.log") | crontab -
+# Remove the cron entry used by earlier versions of this script
+(crontab -l 2>/dev/null | grep -v "autostop.py") | crontab - || true
+
+nohup $PYTHON_DIR $PWD/autostop.py --time $IDLE_TIME --ignore-connections --daemon --interval $CHECK_INTERVAL >> /var/log/jupyter.log 2>&1 &
 
 REPO_ROOT="/home/ec2-user/SageMaker/MachineLearningModels"
 
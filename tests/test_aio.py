@@ -0,0 +1,166 @@
+import asyncio
+import inspect
+import threading
+import time
+import pytest
+import boto3
+import polars as pl
+from utilities.aio import AsyncGlueSchemaReader, AsyncModelVersionManager, AsyncRunner
+from utilities.schema_reader import GlueSchemaReader
+from utilities.version import EnumChangeType, ModelVersionManager
+
+BUCKET = "my-model-bucket"
+PARAM = "model/test/version"
+TABLES = [f"table-{i}" for i in range(50)]
+
+
+def resolve(value):
+    """Runs a coroutine to completion, so sync and async results compare alike."""
+    return asyncio.run(value) if inspect.iscoroutine(value) else value
+
+
+@pytest.fixture
+def aws_resources(moto_endpoint):
+    glue = boto3.client("glue", region_name="eu-west-2")
+    glue.create_database(DatabaseInput={"Name": "test-db"})
+    for i, name in enumerate(TABLES):
+        glue.create_table(
+            DatabaseName="test-db",
+            TableInput={
+                "Name": name,
+                "StorageDescriptor": {
+                    "Columns": [
+                        {"Name": "id", "Type": "bigint"},
+                        {"Name": f"tags_{i}", "Type": "array<struct<k:string>>"},
+                    ]
+                },
+            },
+        )
+    boto3.client("s3", region_name="eu-west-2").create_bucket(
+        Bucket=BUCKET,
+        CreateBucketConfiguration={"LocationConstraint": "eu-west-2"},
+    )
+    boto3.client("ssm", region_name="eu-west-2").put_parameter(
+        Name=PARAM, Value='{"Current Version": "5.6.7"}', Type="String"
+    )
+
+
+@pytest.fixture(params=["sync", "async"])
+def schema_reader(request, aws_resources):
+    if request.param == "sync":
+        yield GlueSchemaReader("test-db")
+    else:
+        reader = AsyncGlueSchemaReader("test-db", max_concurrency=8)
+        yield reader
+        reader.close()
+
+
+@pytest.fixture(params=["sync", "async"])
+def version_manager(request, aws_resources):
+    if request.param == "sync":
+        yield ModelVersionManager(BUCKET, PARAM, PARAM)
+    else:
+        manager = AsyncModelVersionManager(BUCKET, PARAM, PARAM, max_concurrency=8)
+        yield manager
+        manager.close()
+
+
+def test_get_polars_schema(schema_reader):
+    schema = resolve(schema_reader.get_polars_schema("table-3"))
+    assert schema == {
+        "id": pl.Int64,
+        "tags_3": pl.List(pl.Struct({"k": pl.Utf8})),
+    }
+
+
+def test_missing_table_raises(schema_reader):
+    with pytest.raises(ValueError, match="not found"):
+        resolve(schema_reader.get_polars_schema("missing"))
+
+
+def test_version_round_trip(version_manager):
+    assert resolve(version_manager.get_current_version()) == "5.6.7"
+    new_version = resolve(version_manager.get_new_version(EnumChangeType.MINOR))
+    assert new_version == "5.7.0"
+    resolve(version_manager.save_model({"coef": [1.0, 2.0]}, new_version))
+    resolve(version_manager.update_parameter_store(new_version))
+    assert resolve(version_manager.get_current_version()) == "5.7.0"
+    assert resolve(version_manager.load_model()) == {"coef": [1.0, 2.0]}
+    assert resolve(version_manager.list_versions()) == ["5.7.0"]
+
+
+def test_artifact_round_trip(version_manager):
+    key = resolve(version_manager.save_artifact(b"payload", "1.0.0", "extra.json"))
+    assert key == f"{PARAM}/1.0.0/extra.json"
+    assert resolve(version_manager.load_artifact("1.0.0", "extra.json")) == b"payload"
+
+
+def test_get_polars_schemas_fans_out(aws_resources):
+    expected = {
+        name: GlueSchemaReader("test-db").get_polars_schema(name) for name in TABLES
+    }
+
+    async def fetch():
+        async with AsyncGlueSchemaReader("test-db", max_concurrency=16) as reader:
+            return await reader.get_polars_schemas(TABLES)
+
+    assert asyncio.run(fetch()) == expected
+
+
+def test_runner_bounds_concurrency_without_blocking_the_loop():
+    in_flight = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def slow_call(i):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        time.sleep(0.02)
+        with lock:
+            in_flight -= 1
+        return i
+
+    async def fan_out():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.005)
+
+        ticking = asyncio.create_task(ticker())
+        async with AsyncRunner(max_concurrency=4) as runner:
+            results = await asyncio.gather(
+                *(runner.run(slow_call, i) for i in range(40))
+            )
+        ticking.cancel()
+        return results, ticks
+
+    results, ticks = asyncio.run(fan_out())
+    assert results == list(range(40))
+    assert peak == 4
+    assert ticks > 10
+
+
+def test_exiting_the_runner_does_not_block_the_loop():
+    async def exit_with_call_in_flight():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.005)
+
+        async with AsyncRunner(max_concurrency=1) as runner:
+            call = asyncio.ensure_future(runner.run(time.sleep, 0.2))
+            await asyncio.sleep(0.01)
+            ticking = asyncio.create_task(ticker())
+        ticking.cancel()
+        await call
+        return ticks
+
+    assert asyncio.run(exit_with_call_in_flight()) > 10
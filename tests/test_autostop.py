@@ -0,0 +1,193 @@
+import importlib.util
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import Mock, patch
+import pytest
+from botocore.exceptions import ClientError
+
+SCRIPT_PATH = os.path.join(
+    os.path.dirname(__file__), "..", "terraform", "scripts", "autostop.py"
+)
+spec = importlib.util.spec_from_file_location("autostop", SCRIPT_PATH)
+autostop = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(autostop)
+
+
+def _activity(seconds_ago):
+    moment = datetime.now() - timedelta(seconds=seconds_ago)
+    return moment.strftime("%Y-%m-%dT%H:%M:%S.%fz")
+
+
+def _session(state="idle", connections=0, seconds_ago=7200):
+    return {
+        "kernel": {
+            "execution_state": state,
+            "connections": connections,
+            "last_activity": _activity(seconds_ago),
+        }
+    }
+
+
+class FakeJupyter:
+    """A local stand-in for the Jupyter sessions API."""
+
+    def __init__(self):
+        self.sessions = []
+        self.requests = 0
+        self.client_ports = set()
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                fake.requests += 1
+                fake.client_ports.add(self.client_address[1])
+                body = json.dumps(fake.sessions).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def jupyter():
+    server = FakeJupyter()
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def sagemaker():
+    client = Mock()
+    client.describe_notebook_instance.return_value = {
+        "LastModifiedTime": datetime.now() - timedelta(hours=2)
+    }
+    return client
+
+
+def _checker(jupyter, sagemaker, **kwargs):
+    return autostop.AutostopChecker(
+        3600, url=jupyter.url, sagemaker_client=sagemaker, **kwargs
+    )
+
+
+def test_parse_args_reads_daemon_options():
+    options = autostop.parse_args(["-t", "3600", "-c", "--daemon", "-i", "30"])
+    assert options["time"] == 3600
+    assert options["ignore_connections"] is True
+    assert options["daemon"] is True
+    assert options["interval"] == 30
+
+
+def test_parse_args_requires_time():
+    with pytest.raises(SystemExit) as e:
+        autostop.parse_args(["-p", "8888"])
+    assert e.value.code == 2
+
+
+@pytest.mark.parametrize(
+    "sessions, ignore_connections, expected",
+    [
+        ([_session()], False, True),
+        ([_session(seconds_ago=10)], False, False),
+        ([_session(state="busy")], False, False),
+        ([_session(connections=1)], False, False),
+        ([_session(connections=1)], True, True),
+        ([_session(), _session(seconds_ago=10)], True, False),
+    ],
+)
+def test_sessions_are_idle_rules(sessions, ignore_connections, expected):
+    assert autostop.sessions_are_idle(sessions, 3600, ignore_connections) is expected
+
+
+def test_check_uses_last_modified_time_when_no_sessions(jupyter, sagemaker):
+    checker = _checker(jupyter, sagemaker, notebook_name="nb")
+    assert checker.check() is True
+    sagemaker.describe_notebook_instance.assert_called_once_with(
+        NotebookInstanceName="nb"
+    )
+
+
+def test_run_once_stops_idle_notebook(jupyter, sagemaker):
+    jupyter.sessions = [_session()]
+    checker = _checker(jupyter, sagemaker, notebook_name="nb")
+    assert checker.run_once() is True
+    sagemaker.stop_notebook_instance.assert_called_once_with(NotebookInstanceName="nb")
+
+
+def test_run_once_leaves_active_notebook(jupyter, sagemaker):
+    jupyter.sessions = [_session(state="busy")]
+    assert _checker(jupyter, sagemaker).run_once() is False
+    sagemaker.stop_notebook_instance.assert_not_called()
+
+
+def test_run_forever_reuses_connection_and_caches_name(jupyter, sagemaker):
+    jupyter.sessions = [_session(seconds_ago=10)]
+    sleeps = []
+
+    def fake_sleep(seconds):
+        sleeps.append(seconds)
+        if len(sleeps) == 3:
+            jupyter.sessions = [_session()]
+
+    with patch.object(autostop, "get_notebook_name", return_value="nb") as name:
+        _checker(jupyter, sagemaker).run_forever(45, sleep=fake_sleep)
+
+    assert sleeps == [45, 45, 45]
+    assert jupyter.requests == 4
+    assert len(jupyter.client_ports) == 1
+    name.assert_called_once()
+    sagemaker.stop_notebook_instance.assert_called_once_with(NotebookInstanceName="nb")
+
+
+def test_run_forever_survives_unreachable_jupyter(sagemaker):
+    checker = autostop.AutostopChecker(
+        3600, url="http://127.0.0.1:1", sagemaker_client=sagemaker
+    )
+    calls = []
+
+    def fake_sleep(seconds):
+        calls.append(seconds)
+        if len(calls) == 2:
+            raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        checker.run_forever(5, sleep=fake_sleep)
+    assert calls == [5, 5]
+
+
+def test_run_forever_survives_sagemaker_errors(jupyter, sagemaker):
+    throttled = ClientError(
+        {"Error": {"Code": "ThrottlingException", "Message": "Rate exceeded"}},
+        "DescribeNotebookInstance",
+    )
+    sagemaker.describe_notebook_instance.side_effect = [
+        throttled,
+        sagemaker.describe_notebook_instance.return_value,
+        sagemaker.describe_notebook_instance.return_value,
+    ]
+    sagemaker.stop_notebook_instance.side_effect = [KeyError("boom"), None]
+    sleeps = []
+
+    checker = _checker(jupyter, sagemaker, notebook_name="nb")
+    checker.run_forever(5, sleep=sleeps.append)
+
+    assert sleeps == [5, 5]
+    assert sagemaker.stop_notebook_instance.call_count == 2
@@ -0,0 +1,122 @@
+import io
+import json
+import pytest
+from benchmarks.harness import (
+    BenchmarkResult,
+    compare_to_baseline,
+    measure,
+)
+from benchmarks import run
+from benchmarks.run import nested_type, run_suite
+from utilities.instrumentation import MetricsRegistry, instrument_client
+from utilities.schema_reader import GlueSchemaReader
+
+
+def _result(name, seconds=0.1, memory=1000, transferred=100):
+    return BenchmarkResult(
+        name=name,
+        seconds=seconds,
+        peak_memory_bytes=memory,
+        bytes_transferred=transferred,
+    )
+
+
+@pytest.fixture
+def baseline():
+    return {
+        "case": {"seconds": 0.1, "peak_memory_bytes": 1000, "bytes_transferred": 100}
+    }
+
+
+def test_nested_type_parses_to_expected_depth(mocked_aws):
+    reader = GlueSchemaReader("test-db")
+    polars_type = reader.get_polars_type(nested_type(3, 5))
+    depth = 0
+    while hasattr(polars_type, "fields"):
+        assert len(polars_type.fields) == 5
+        polars_type = polars_type.fields[0].dtype.inner
+        depth += 1
+    assert depth == 3
+
+
+def test_compare_to_baseline_within_tolerance(baseline):
+    assert compare_to_baseline([_result("case", seconds=0.15)], baseline) == []
+
+
+def test_compare_to_baseline_gates_deterministic_metrics_by_default(baseline):
+    regressions = compare_to_baseline(
+        [_result("case", seconds=0.5, memory=2000, transferred=200)], baseline
+    )
+    assert len(regressions) == 2
+    assert regressions[0].startswith("case: peak_memory_bytes")
+    assert compare_to_baseline([_result("case", seconds=0.5)], baseline) == []
+
+
+def test_compare_to_baseline_flags_time_when_asked(baseline):
+    regressions = compare_to_baseline(
+        [_result("case", seconds=0.5, memory=2000, transferred=200)],
+        baseline,
+        metrics=("seconds",),
+    )
+    assert len(regressions) == 1
+    assert regressions[0].startswith("case: seconds")
+
+
+def test_compare_to_baseline_ignores_new_cases_and_tiny_timings(baseline):
+    baseline["tiny"] = {
+        "seconds": 0.00001,
+        "peak_memory_bytes": 10,
+        "bytes_transferred": 0,
+    }
+    results = [
+        _result("new"),
+        _result("tiny", seconds=0.0001, memory=10, transferred=0),
+    ]
+    all_metrics = ("seconds", "peak_memory_bytes", "bytes_transferred")
+    assert compare_to_baseline(results, baseline, metrics=all_metrics) == []
+
+
+def test_main_warns_about_slower_wall_time_unless_gated(
+    monkeypatch, tmp_path, baseline, capsys
+):
+    monkeypatch.setattr(run, "run_suite", lambda quick: [_result("case", seconds=0.5)])
+    path = tmp_path / "baseline.json"
+    path.write_text(json.dumps(baseline))
+    argv = ["--baseline", str(path), "--output", str(tmp_path / "out.json")]
+
+    assert run.main(argv) == 0
+    assert "WARNING case: seconds" in capsys.readouterr().out
+    assert run.main(argv + ["--gate-time"]) == 1
+    assert "REGRESSION case: seconds" in capsys.readouterr().out
+
+
+def test_measure_warms_up_before_tracing_memory():
+    calls = []
+
+    def first_call_allocates():
+        calls.append(bytearray(10_000_000 if not calls else 10))
+
+    result = measure("warm", first_call_allocates, repeat=1)
+    assert len(calls) == 3
+    assert result.peak_memory_bytes < 1_000_000
+
+
+def test_measure_counts_s3_bytes(mocked_aws, s3_client, s3_bucket, model_bucket):
+    registry = MetricsRegistry()
+    instrument_client(s3_client, registry)
+
+    def round_trip():
+        s3_client.upload_fileobj(io.BytesIO(b"x" * 500), model_bucket, "key")
+        s3_client.download_fileobj(model_bucket, "key", io.BytesIO())
+
+    result = measure("round_trip", round_trip, registry=registry, repeat=1)
+    assert result.bytes_transferred == 1000
+    assert result.seconds > 0
+    assert result.peak_memory_bytes > 0
+
+
+def test_run_suite_quick_covers_hot_paths():
+    names = [result.name for result in run_suite(quick=True)]
+    assert "get_polars_type[crazy]" in names
+    assert "get_polars_schema[columns=100]" in names
+    assert "load_model[coefficients=100000]" in names
@@ -0,0 +1,141 @@
+import pytest
+import numpy as np
+import polars as pl
+from sklearn.linear_model import LinearRegression
+from utilities.bootstrap import BootstrapResult, bootstrap_linear_model, weighted_sums
+from utilities.version import ModelVersionManager
+
+FEATURES = ["MeanDailyTemperature", "rain"]
+
+
+@pytest.fixture
+def sales_lf():
+    rng = np.random.default_rng(21)
+    n = 5000
+    df = pl.DataFrame(
+        {
+            "MeanDailyTemperature": rng.uniform(0, 30, n),
+            "rain": rng.uniform(0, 10, n),
+        }
+    )
+    return df.with_columns(
+        IceCreamSales=20 * pl.col("MeanDailyTemperature")
+        - 5 * pl.col("rain")
+        + 100
+        + rng.normal(0, 10, n)
+    ).lazy()
+
+
+@pytest.fixture
+def result(sales_lf):
+    return bootstrap_linear_model(
+        sales_lf, FEATURES, "IceCreamSales", n_resamples=400, chunk_size=1500
+    )
+
+
+def test_estimate_matches_linear_regression(sales_lf, result):
+    df = sales_lf.collect()
+    model = LinearRegression().fit(df.select(FEATURES), df["IceCreamSales"])
+    assert result.terms == ["intercept"] + FEATURES
+    np.testing.assert_allclose(
+        result.estimate, [model.intercept_, *model.coef_], rtol=1e-8
+    )
+    assert result.draws.shape == (400, 3)
+    assert result.n_rows == 5000
+
+
+def test_estimate_is_accurate_with_a_large_offset_feature():
+    rng = np.random.default_rng(5)
+    n = 5000
+    df = pl.DataFrame(
+        {
+            "import_date": rng.integers(20240000, 20241231, n).astype(float),
+            "rain": rng.uniform(0, 10, n),
+        }
+    ).with_columns(
+        sales=0.5 * pl.col("import_date") - 5 * pl.col("rain") + rng.normal(0, 10, n)
+    )
+    features = ["import_date", "rain"]
+    result = bootstrap_linear_model(df.lazy(), features, "sales", n_resamples=50)
+    model = LinearRegression().fit(df.select(features), df["sales"])
+    np.testing.assert_allclose(
+        result.estimate, [model.intercept_, *model.coef_], rtol=1e-8
+    )
+    assert result.draws[:, 1].std() < 0.01
+
+
+def test_weighted_sums_match_weighted_least_squares():
+    rng = np.random.default_rng(0)
+    x = np.column_stack([np.ones(50), rng.normal(size=50)])
+    y = 3 * x[:, 1] + 1 + rng.normal(size=50)
+    cross = (x[:, :, None] * x[:, None, :]).reshape(50, 4)
+    seed = np.random.SeedSequence(1)
+
+    xtx, xty = weighted_sums(cross, x * y[:, None], 5, seed)
+
+    weights = np.random.default_rng(seed).poisson(1.0, size=(5, 50))
+    for b in range(5):
+        expected = LinearRegression().fit(x[:, 1:], y, sample_weight=weights[b])
+        solved = np.linalg.solve(xtx[b].reshape(2, 2), xty[b])
+        np.testing.assert_allclose(
+            solved, [expected.intercept_, expected.coef_[0]], rtol=1e-8
+        )
+
+
+def test_intervals_cover_true_coefficients_and_match_standard_errors(sales_lf, result):
+    intervals = result.coefficient_intervals(alpha=0.01)
+    for term, true in zip(intervals["term"], [100, 20, -5]):
+        row = intervals.filter(pl.col("term") == term).row(0, named=True)
+        assert row["lower"] < true < row["upper"]
+    df = sales_lf.collect()
+    x = np.column_stack([np.ones(df.height), df.select(FEATURES).to_numpy()])
+    residuals = df["IceCreamSales"].to_numpy() - x @ result.estimate
+    sigma2 = residuals.var(ddof=3)
+    analytic = np.sqrt(np.diag(sigma2 * np.linalg.inv(x.T @ x)))
+    np.testing.assert_allclose(intervals["std_error"], analytic, rtol=0.2)
+
+
+def test_results_do_not_depend_on_worker_count(sales_lf, result):
+    again = bootstrap_linear_model(
+        sales_lf,
+        FEATURES,
+        "IceCreamSales",
+        n_resamples=400,
+        chunk_size=1500,
+        max_workers=1,
+    )
+    np.testing.assert_array_equal(again.draws, result.draws)
+
+
+def test_prediction_intervals_are_wider_than_confidence_intervals(result):
+    x = pl.DataFrame({"MeanDailyTemperature": [10.0, 25.0], "rain": [0.0, 5.0]})
+    confidence = result.prediction_intervals(x, kind="confidence")
+    prediction = result.prediction_intervals(x, kind="prediction")
+    np.testing.assert_allclose(
+        confidence["prediction"], result.estimate @ [[1, 1], [10, 25], [0, 5]]
+    )
+    assert (confidence["lower"] < confidence["prediction"]).all()
+    assert (prediction["upper"] - prediction["lower"] > 30).all()
+    assert (
+        prediction["upper"] - prediction["lower"]
+        > confidence["upper"] - confidence["lower"]
+    ).all()
+    with pytest.raises(ValueError, match="Expected rows of 2 features"):
+        result.prediction_intervals(np.ones((1, 3)))
+
+
+def test_without_intercept(sales_lf):
+    result = bootstrap_linear_model(
+        sales_lf, FEATURES, "IceCreamSales", n_resamples=20, fit_intercept=False
+    )
+    assert result.terms == FEATURES
+    assert result.features == FEATURES
+
+
+def test_save_and_load_with_model_version(mocked_aws, s3_bucket, model_bucket, result):
+    manager = ModelVersionManager(model_bucket, "models/bootstrap", "models/bootstrap")
+    key = result.save(manager, "1.0.0")
+    assert key == "models/bootstrap/1.0.0/bootstrap.json"
+    loaded = BootstrapResult.load(manager, "1.0.0")
+    np.testing.assert_array_equal(loaded.draws, result.draws)
+    assert loaded.coefficient_intervals().equals(result.coefficient_intervals())
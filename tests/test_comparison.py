@@ -0,0 +1,133 @@
+import pytest
+import numpy as np
+import polars as pl
+from sklearn.linear_model import LinearRegression, RidgeClassifier
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+from sklearn.tree import DecisionTreeRegressor
+from utilities.comparison import (
+    compare_versions,
+    comparison_query,
+    prediction_expr,
+    resolve_versions,
+)
+from utilities.version import ModelVersionManager
+
+FEATURES = ["MeanDailyTemperature", "rain"]
+
+
+@pytest.fixture
+def evaluation_df():
+    rng = np.random.default_rng(11)
+    n = 2000
+    df = pl.DataFrame(
+        {
+            "MeanDailyTemperature": rng.uniform(0, 30, n),
+            "rain": rng.uniform(0, 10, n),
+        }
+    )
+    return df.with_columns(
+        IceCreamSales=20 * pl.col("MeanDailyTemperature")
+        - 5 * pl.col("rain")
+        + 100
+        + rng.normal(0, 10, n)
+    )
+
+
+@pytest.fixture
+def manager(mocked_aws, s3_bucket, ssm_parameter, model_bucket, evaluation_df):
+    manager = ModelVersionManager(
+        model_bucket, "model/test/version", "model/test/version"
+    )
+    x = evaluation_df.select(FEATURES)
+    y = evaluation_df["IceCreamSales"]
+    manager.save_model(LinearRegression().fit(x, y), "5.6.7")
+    manager.save_model(LinearRegression().fit(x[:, :1], y), "5.10.0")
+    manager.save_model(DecisionTreeRegressor(max_depth=3).fit(x, y), "5.9.1")
+    manager.save_artifact(b"{}", "not-a-version", "extra.json")
+    return manager
+
+
+def test_list_versions_is_semantically_sorted(manager):
+    assert manager.list_versions() == ["5.6.7", "5.9.1", "5.10.0"]
+
+
+def test_resolve_versions(manager):
+    assert resolve_versions(manager, last=2) == ["5.9.1", "5.10.0"]
+    assert resolve_versions(manager, versions=["5.6.7", "5.6.7"]) == ["5.6.7"]
+    with pytest.raises(ValueError, match="exactly one"):
+        resolve_versions(manager)
+    for last in (0, -1):
+        with pytest.raises(ValueError, match="at least 1"):
+            resolve_versions(manager, last=last)
+
+
+def test_margin_classifier_is_scored_with_its_predict(evaluation_df):
+    x = evaluation_df.select(FEATURES)
+    model = RidgeClassifier().fit(x, evaluation_df["IceCreamSales"] > 300)
+    result = evaluation_df.select(prediction_expr(model, FEATURES, "prediction"))
+    np.testing.assert_array_equal(result["prediction"], model.predict(x))
+
+
+def test_compare_versions_matches_sklearn_metrics(manager, evaluation_df, tmp_path):
+    x = evaluation_df.select(FEATURES)
+    y = evaluation_df["IceCreamSales"].to_numpy()
+    output = tmp_path / "comparison.csv"
+
+    table = compare_versions(
+        evaluation_df.lazy(),
+        manager,
+        "IceCreamSales",
+        versions=["5.6.7", "5.9.1"],
+        output=str(output),
+    )
+
+    assert table["version"].to_list() == ["5.6.7", "5.9.1"]
+    assert table["rank"].to_list() == [1, 2]
+    assert table["current"].to_list() == [True, False]
+    for row in table.iter_rows(named=True):
+        predictions = manager.load_model(row["version"]).predict(x)
+        assert row["n"] == 2000
+        assert row["r2"] == pytest.approx(r2_score(y, predictions))
+        assert row["mae"] == pytest.approx(mean_absolute_error(y, predictions))
+        assert row["rmse"] == pytest.approx(np.sqrt(mean_squared_error(y, predictions)))
+    assert pl.read_csv(output)["version"].to_list() == ["5.6.7", "5.9.1"]
+
+
+def test_comparison_query_scans_data_once(manager, evaluation_df, tmp_path):
+    path = tmp_path / "evaluation.parquet"
+    evaluation_df.with_columns(other=pl.lit(1)).write_parquet(path)
+    models = {v: manager.load_model(v) for v in manager.list_versions()}
+
+    query = comparison_query(pl.scan_parquet(path), models, "IceCreamSales")
+
+    assert query.explain().count("SCAN") == 1
+    assert query.collect().columns == ["n", "ss_tot"] + [
+        f"{v}|{s}" for v in models for s in ("ss_res", "abs_res")
+    ]
+
+
+def test_compare_versions_ranks_by_r2(manager, evaluation_df):
+    table = compare_versions(
+        evaluation_df.lazy(), manager, "IceCreamSales", last=3, rank_by="r2"
+    )
+    assert table["r2"].is_sorted(descending=True)
+    assert table["version"][0] == "5.6.7"
+
+
+def test_compare_versions_with_explicit_features(manager, evaluation_df):
+    table = compare_versions(
+        evaluation_df.lazy(),
+        manager,
+        "IceCreamSales",
+        features=["MeanDailyTemperature"],
+        versions=["5.10.0"],
+    )
+    assert table["r2"][0] > 0.5
+    with pytest.raises(ValueError, match="Got 1 features"):
+        compare_versions(
+            evaluation_df.lazy(),
+            manager,
+            "IceCreamSales",
+            features=["MeanDailyTemperature"],
+            versions=["5.6.7"],
+        )
@@ -0,0 +1,160 @@
+import pytest
+import numpy as np
+import polars as pl
+from sklearn.linear_model import (
+    ElasticNet,
+    Lasso,
+    LinearRegression,
+    LogisticRegression,
+    Perceptron,
+    PoissonRegressor,
+    Ridge,
+    RidgeClassifier,
+    SGDClassifier,
+    TweedieRegressor,
+)
+from sklearn.svm import LinearSVC
+from utilities.compiler import compile_linear_model, infer_link, load_compiled_model
+from utilities.version import ModelVersionManager
+
+FEATURES = ["MeanDailyTemperature", "rain", "weekend"]
+
+
+@pytest.fixture
+def training_df():
+    rng = np.random.default_rng(5)
+    n = 500
+    df = pl.DataFrame(
+        {
+            "MeanDailyTemperature": rng.uniform(0, 30, n),
+            "rain": rng.uniform(0, 10, n),
+            "weekend": rng.integers(0, 2, n),
+        }
+    )
+    return df.with_columns(
+        sales=20 * pl.col("MeanDailyTemperature")
+        - 3 * pl.col("rain")
+        + 50 * pl.col("weekend")
+        + 100
+        + rng.normal(0, 5, n)
+    )
+
+
+def _target(df, model):
+    y = df["sales"].to_numpy()
+    if isinstance(model, LogisticRegression):
+        return (y > np.median(y)).astype(int)
+    if isinstance(model, (PoissonRegressor, TweedieRegressor)):
+        return np.round(y / 100)
+    return y
+
+
+@pytest.mark.parametrize(
+    "model",
+    [
+        LinearRegression(),
+        Ridge(alpha=1.0),
+        Lasso(alpha=5.0),
+        ElasticNet(alpha=0.5),
+        PoissonRegressor(),
+        TweedieRegressor(power=1.5),
+        LogisticRegression(),
+    ],
+)
+def test_compiled_expression_matches_sklearn(training_df, model):
+    x = training_df.select(FEATURES)
+    model.fit(x, _target(training_df, model))
+    expected = (
+        model.predict_proba(x)[:, 1]
+        if isinstance(model, LogisticRegression)
+        else model.predict(x)
+    )
+
+    expr = compile_linear_model(model)
+    result = training_df.lazy().select(expr).collect(engine="streaming")
+    np.testing.assert_allclose(result["prediction"].to_numpy(), expected, rtol=1e-9)
+
+
+def test_infer_link():
+    assert infer_link(LinearRegression()) == "identity"
+    assert infer_link(LogisticRegression()) == "logit"
+    assert infer_link(SGDClassifier(loss="log_loss")) == "logit"
+    for model in [RidgeClassifier(), LinearSVC(), Perceptron(), SGDClassifier()]:
+        with pytest.raises(ValueError, match="does not model probabilities"):
+            infer_link(model)
+
+
+def test_margin_classifier_needs_explicit_link(training_df):
+    x = training_df.select(FEATURES)
+    model = LinearSVC().fit(x, training_df["sales"] > 400)
+    with pytest.raises(ValueError, match="pass `link`"):
+        compile_linear_model(model)
+    expr = compile_linear_model(model, link="identity")
+    result = training_df.select(expr)["prediction"].to_numpy()
+    np.testing.assert_allclose(result, model.decision_function(x), rtol=1e-9)
+
+
+def test_zero_coefficients_are_pruned_from_projection(training_df):
+    model = LinearRegression()
+    model.coef_ = np.array([2.0, 0.0, 1.0])
+    model.intercept_ = 1.0
+    expr = compile_linear_model(model, features=FEATURES)
+    plan = training_df.lazy().select(expr).explain()
+    assert 'PROJECT["MeanDailyTemperature", "weekend"]' in plan
+    assert training_df.select(expr)["prediction"][0] == pytest.approx(
+        2 * training_df["MeanDailyTemperature"][0] + training_df["weekend"][0] + 1
+    )
+
+
+def test_clip_and_custom_name(training_df):
+    model = LinearRegression()
+    model.coef_ = np.array([1.0, -100.0, 0.0])
+    model.intercept_ = 0.0
+    expr = compile_linear_model(
+        model, features=FEATURES, clip=(0.0, None), name="posts"
+    )
+    result = training_df.select(expr)
+    assert result.columns == ["posts"]
+    assert result["posts"].min() == 0.0
+
+
+def test_nulls_propagate(training_df):
+    model = LinearRegression()
+    model.coef_ = np.array([1.0])
+    model.intercept_ = 0.0
+    result = pl.DataFrame({"a": [1.0, None]}).select(
+        compile_linear_model(model, features=["a"])
+    )
+    assert result["prediction"].to_list() == [1.0, None]
+
+
+def test_requires_feature_names(training_df):
+    model = LinearRegression().fit(
+        training_df.select(FEATURES).to_numpy(), training_df["sales"].to_numpy()
+    )
+    with pytest.raises(ValueError, match="pass `features`"):
+        compile_linear_model(model)
+    with pytest.raises(ValueError, match="Got 2 features"):
+        compile_linear_model(model, features=FEATURES[:2])
+
+
+def test_rejects_multiclass_and_non_linear_models(training_df):
+    x = training_df.select(FEATURES)
+    y = np.digitize(training_df["sales"].to_numpy(), [300, 500])
+    with pytest.raises(ValueError, match="single-output"):
+        compile_linear_model(LogisticRegression().fit(x, y))
+    with pytest.raises(ValueError, match="not a fitted linear model"):
+        compile_linear_model(LinearRegression())
+
+
+def test_load_compiled_model(
+    mocked_aws, s3_bucket, ssm_parameter, model_bucket, training_df
+):
+    manager = ModelVersionManager(model_bucket, "models/compiled", "model/test/version")
+    model = LinearRegression().fit(training_df.select(FEATURES), training_df["sales"])
+    manager.save_model(model, "5.6.7")
+    expr = load_compiled_model(manager)
+    np.testing.assert_allclose(
+        training_df.select(expr)["prediction"].to_numpy(),
+        model.predict(training_df.select(FEATURES)),
+    )
@@ -0,0 +1,168 @@
+import pytest
+from datetime import date, timedelta
+from decimal import Decimal
+import numpy as np
+import polars as pl
+from utilities.drift import (
+    DatasetSketch,
+    NumericSketch,
+    CategoricalSketch,
+    compare_sketches,
+)
+from utilities.version import ModelVersionManager
+
+
+@pytest.fixture
+def reference_lf():
+    rng = np.random.default_rng(7)
+    n = 5000
+    return pl.LazyFrame(
+        {
+            "temperature": rng.normal(15, 5, n),
+            "sales": rng.exponential(200, n),
+            "careHome": rng.choice(["Y", "N"], n, p=[0.3, 0.7]),
+            "nested": [[1]] * n,
+        }
+    )
+
+
+@pytest.fixture
+def shifted_lf():
+    rng = np.random.default_rng(8)
+    n = 5000
+    return pl.LazyFrame(
+        {
+            "temperature": rng.normal(25, 5, n),
+            "sales": rng.exponential(200, n),
+            "careHome": rng.choice(["Y", "N"], n, p=[0.7, 0.3]),
+        }
+    )
+
+
+def test_from_lazyframe_builds_sketch_per_supported_column(reference_lf):
+    sketch = DatasetSketch.from_lazyframe(reference_lf)
+    assert sketch.row_count == 5000
+    assert isinstance(sketch.columns["temperature"], NumericSketch)
+    assert isinstance(sketch.columns["careHome"], CategoricalSketch)
+    assert "nested" not in sketch.columns
+
+
+def test_numeric_quantiles_within_relative_accuracy():
+    values = np.arange(1, 10001, dtype=float)
+    sketch = DatasetSketch.from_lazyframe(pl.LazyFrame({"x": values})).columns["x"]
+    for q in (0.1, 0.5, 0.9):
+        expected = np.quantile(values, q)
+        assert sketch.quantile(q) == pytest.approx(expected, rel=0.02)
+
+
+def test_numeric_sketch_handles_nulls_zeros_and_negatives():
+    lf = pl.LazyFrame({"x": [-5.0, -1.0, 0.0, 0.0, None, 3.0]})
+    sketch = DatasetSketch.from_lazyframe(lf).columns["x"]
+    assert sketch.count == 5
+    assert sketch.null_count == 1
+    assert sketch.zero_count == 2
+    assert sketch.null_rate == pytest.approx(1 / 6)
+    assert sketch.quantile(0.0) == -5.0
+    assert sketch.quantile(1.0) == 3.0
+    assert sketch.quantile(0.5) == 0.0
+
+
+def test_numeric_sketch_counts_non_finite_values_separately():
+    lf = pl.LazyFrame({"x": [1.0, float("nan"), float("inf"), -float("inf"), None]})
+    sketch = DatasetSketch.from_lazyframe(lf).columns["x"]
+    assert sketch.count == 1
+    assert sketch.nonfinite_count == 3
+    assert sketch.null_count == 1
+    assert sketch.nonfinite_rate == pytest.approx(3 / 5)
+    assert (sketch.min, sketch.max) == (1.0, 1.0)
+    assert sketch.merge(sketch).nonfinite_count == 6
+    assert NumericSketch.from_dict(sketch.to_dict()) == sketch
+
+
+def test_decimal_columns_are_sketched_on_their_value_whatever_the_scale():
+    values = [Decimal("1.50"), Decimal("2.50"), Decimal("3.25")] * 100
+    sketches = [
+        DatasetSketch.from_lazyframe(
+            pl.LazyFrame({"price": pl.Series(values, dtype=pl.Decimal(p, s))})
+        )
+        for p, s in ((10, 2), (12, 4))
+    ]
+    for sketch in sketches:
+        assert sketch.columns["price"].quantile(0.5) == pytest.approx(2.5, rel=0.02)
+        assert sketch.columns["price"].max == 3.25
+
+    report = compare_sketches(*sketches).row(0, named=True)
+    assert report["psi"] == pytest.approx(0.0)
+    assert report["ks"] == pytest.approx(0.0)
+    assert not report["drifted"]
+
+
+def test_compare_sketches_detects_date_drift():
+    def dates(start):
+        return pl.LazyFrame(
+            {"day": pl.date_range(start, start + timedelta(days=179), eager=True)}
+        )
+
+    reference = DatasetSketch.from_lazyframe(dates(date(2024, 1, 1)))
+    shifted = DatasetSketch.from_lazyframe(dates(date(2024, 3, 1)))
+    day = reference.columns["day"]
+    assert day.bin_width == 1.0
+    assert day.quantile(0.5) == pytest.approx(
+        date(2024, 3, 30).toordinal() - 719163, abs=1
+    )
+
+    report = compare_sketches(reference, shifted)
+    assert report.row(0, named=True)["drifted"]
+    assert not compare_sketches(reference, reference)["drifted"].any()
+
+
+def test_merge_matches_sketch_of_concatenated_data(reference_lf):
+    first = reference_lf.slice(0, 2000)
+    second = reference_lf.slice(2000)
+    merged = DatasetSketch.from_lazyframe(first).merge(
+        DatasetSketch.from_lazyframe(second)
+    )
+    whole = DatasetSketch.from_lazyframe(reference_lf)
+    assert merged == whole
+
+
+def test_categorical_sketch_caps_categories():
+    lf = pl.LazyFrame({"c": ["a"] * 5 + ["b"] * 3 + ["c", "d", None]})
+    sketch = DatasetSketch.from_lazyframe(lf, max_categories=2).columns["c"]
+    assert sketch.frequencies == {"a": 5, "b": 3}
+    assert sketch.other_count == 2
+    assert sketch.null_count == 1
+
+
+def test_json_round_trip(reference_lf):
+    sketch = DatasetSketch.from_lazyframe(reference_lf)
+    assert DatasetSketch.from_json(sketch.to_json()) == sketch
+
+
+def test_compare_sketches_flags_shifted_columns_only(reference_lf, shifted_lf):
+    reference = DatasetSketch.from_lazyframe(reference_lf)
+    current = DatasetSketch.from_lazyframe(shifted_lf)
+    report = compare_sketches(reference, current)
+    drifted = dict(zip(report["column"], report["drifted"]))
+    assert drifted == {"temperature": True, "sales": False, "careHome": True}
+    temperature = report.filter(pl.col("column") == "temperature").row(0, named=True)
+    assert temperature["ks"] > 0.5
+    sales = report.filter(pl.col("column") == "sales").row(0, named=True)
+    assert sales["ks"] < 0.05
+
+
+def test_compare_sketches_identical_data_has_no_drift(reference_lf):
+    sketch = DatasetSketch.from_lazyframe(reference_lf)
+    report = compare_sketches(sketch, sketch)
+    assert report["psi"].max() == pytest.approx(0.0)
+    assert not report["drifted"].any()
+
+
+def test_save_and_load_with_model_version(
+    mocked_aws, s3_bucket, ssm_parameter, model_bucket, reference_lf
+):
+    manager = ModelVersionManager(model_bucket, "model/test", "model/test/version")
+    sketch = DatasetSketch.from_lazyframe(reference_lf)
+    key = sketch.save(manager, "1.0.0")
+    assert key == "model/test/1.0.0/drift_sketch.json"
+    assert DatasetSketch.load(manager, "1.0.0") == sketch
@@ -0,0 +1,191 @@
+import json
+import statistics
+import time
+from datetime import date, datetime, timedelta, timezone
+import pytest
+import boto3
+import polars as pl
+from utilities.experiments import (
+    ExperimentStore,
+    RunRecord,
+    dataset_fingerprint,
+    metric_value,
+)
+from utilities.version import ModelVersionManager
+
+NOW = datetime.now(timezone.utc)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ExperimentStore(str(tmp_path / "experiments"))
+
+
+def _run(segment, r2, days_ago=0, model_name="posts", **kwargs):
+    return RunRecord(
+        model_name=model_name,
+        version="1.0.0",
+        metrics={"r2": r2, "rmse": 1 - r2},
+        params={"alpha": 0.1},
+        timings={"fit_seconds": 0.5},
+        n_train_rows=100,
+        segment=segment,
+        recorded_at=NOW - timedelta(days=days_ago),
+        **kwargs,
+    )
+
+
+def test_record_writes_one_partitioned_file_per_run(store, tmp_path):
+    record = _run("careHome_Y", 0.9, model_name="models/posts/version")
+    path = store.record(record)
+    assert path == (
+        f"{tmp_path}/experiments/model_name=models%2Fposts%2Fversion/"
+        f"date={NOW.date().isoformat()}/{record.run_id}.parquet"
+    )
+
+    runs = store.scan().collect()
+    assert runs.height == 1
+    row = runs.row(0, named=True)
+    assert row["model_name"] == "models/posts/version"
+    assert row["date"] == NOW.date()
+    assert json.loads(row["params"]) == {"alpha": 0.1}
+    assert runs.select(metric_value("r2"))["metrics"][0] == 0.9
+    assert runs.select(metric_value("fit_seconds", "timings"))["timings"][0] == 0.5
+
+
+def test_scan_of_empty_store_has_the_run_schema(store):
+    runs = store.scan(model_name="posts").collect()
+    assert runs.height == 0
+    assert "metrics" in runs.columns and "date" in runs.columns
+
+
+def test_best_runs_per_segment_over_last_90_days(store):
+    for record in [
+        _run("careHome_Y", 0.80),
+        _run("careHome_Y", 0.85, days_ago=10),
+        _run("careHome_Y", 0.99, days_ago=200),
+        _run("careHome_N", 0.70, days_ago=5),
+        _run("careHome_N", 0.95, model_name="other"),
+    ]:
+        store.record(record)
+
+    best = store.best_runs(metric="r2", by="segment", model_name="posts")
+    assert best.select("segment", "r2").rows() == [
+        ("careHome_N", 0.70),
+        ("careHome_Y", 0.85),
+    ]
+
+    lowest_rmse = store.best_runs(
+        metric="rmse", days=None, model_name="posts", higher_is_better=False
+    )
+    assert lowest_rmse.filter(pl.col("segment") == "careHome_Y")["rmse"][
+        0
+    ] == pytest.approx(0.01)
+
+
+def test_partition_filters_skip_other_directories(store, tmp_path):
+    store.record(_run("careHome_Y", 0.8))
+    old = tmp_path / "experiments" / "model_name=posts" / "date=2000-01-01"
+    old.mkdir(parents=True)
+    (old / "corrupt.parquet").write_bytes(b"not parquet")
+    other = tmp_path / "experiments" / "model_name=other" / f"date={NOW.date()}"
+    other.mkdir(parents=True)
+    (other / "corrupt.parquet").write_bytes(b"not parquet")
+
+    runs = store.scan(model_name="posts", since=date(2020, 1, 1)).collect()
+    assert runs.height == 1
+    with pytest.raises(Exception):
+        store.scan().collect()
+
+
+def test_compact_merges_each_partition_into_one_file(store, tmp_path):
+    records = [_run(f"segment_{i % 3}", i / 10, days_ago=i % 2) for i in range(6)]
+    records.append(_run("segment_0", 0.5, model_name="other"))
+    for record in records:
+        store.record(record)
+    before = store.scan().collect().sort("run_id")
+
+    assert store.compact(model_name="posts") == 4
+    files = sorted(
+        p.relative_to(tmp_path / "experiments").parent.as_posix()
+        for p in (tmp_path / "experiments").rglob("*.parquet")
+    )
+    assert files == [
+        f"model_name=other/date={NOW.date()}",
+        f"model_name=posts/date={(NOW - timedelta(days=1)).date()}",
+        f"model_name=posts/date={NOW.date()}",
+    ]
+    assert store.scan().collect().sort("run_id").equals(before)
+    assert store.compact() == 0
+
+
+def test_best_runs_over_a_thousand_compacted_runs_is_fast(store):
+    for i in range(1000):
+        store.record(_run(f"segment_{i % 20}", i / 1000, days_ago=i % 3))
+    store.compact()
+    store.best_runs(by="segment")
+
+    timings = []
+    for _ in range(5):
+        start = time.perf_counter()
+        best = store.best_runs(by="segment")
+        timings.append(time.perf_counter() - start)
+    assert best.height == 20
+    assert best["r2"].min() == pytest.approx(0.980)
+    assert statistics.median(timings) < 0.1
+
+
+def test_dataset_fingerprint_ignores_row_order_but_not_content():
+    df = pl.DataFrame({"beds": [1, 2, 3], "careHome": ["Y", "N", "Y"]})
+    fingerprint = dataset_fingerprint(df.lazy())
+    assert len(fingerprint) == 16
+    assert dataset_fingerprint(df.reverse().lazy()) == fingerprint
+    changed = df.with_columns(beds=pl.Series([1, 2, 4]))
+    assert dataset_fingerprint(changed.lazy()) != fingerprint
+    assert dataset_fingerprint(df.cast({"beds": pl.Int32}).lazy()) != fingerprint
+
+
+def test_version_manager_record_run(mocked_aws, tmp_path):
+    manager = ModelVersionManager(
+        "my-model-bucket",
+        "models/posts",
+        "models/posts/version",
+        experiment_store=ExperimentStore(str(tmp_path)),
+    )
+    manager.record_run("1.2.0", {"r2": 0.9}, n_train_rows=10, n_test_rows=5)
+    row = manager.experiment_store.scan().collect().row(0, named=True)
+    assert row["model_name"] == "models/posts/version"
+    assert row["artifact_key"] == "models/posts/1.2.0/model.pkl"
+    assert (row["n_train_rows"], row["n_test_rows"]) == (10, 5)
+
+    without_store = ModelVersionManager("b", "p", "n")
+    assert without_store.record_run("1.2.0", {"r2": 0.9}) is None
+
+
+def test_s3_store_round_trip(moto_endpoint):
+    boto3.client("s3", region_name="eu-west-2").create_bucket(
+        Bucket="experiments",
+        CreateBucketConfiguration={"LocationConstraint": "eu-west-2"},
+    )
+    store = ExperimentStore(
+        "s3://experiments/runs",
+        storage_options={
+            "aws_endpoint_url": moto_endpoint,
+            "aws_allow_http": "true",
+            "aws_region": "eu-west-2",
+        },
+    )
+    record = _run("careHome_Y", 0.9)
+    path = store.record(record)
+    assert path.startswith("s3://experiments/runs/model_name=posts/date=")
+    best = store.best_runs(model_name="posts")
+    assert best["run_id"].to_list() == [record.run_id]
+
+    second = _run("careHome_N", 0.8)
+    store.record(second)
+    assert store.compact() == 1
+    keys = boto3.client("s3", region_name="eu-west-2").list_objects_v2(
+        Bucket="experiments"
+    )["Contents"]
+    assert len(keys) == 1
+    assert set(store.scan().collect()["run_id"]) == {record.run_id, second.run_id}
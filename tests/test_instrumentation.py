@@ -0,0 +1,125 @@
+import io
+import json
+import logging
+import pytest
+import boto3
+from botocore.stub import Stubber
+from utilities.instrumentation import REGISTRY, MetricsRegistry, instrument_client
+from utilities.schema_reader import GlueSchemaReader
+from utilities.version import ModelVersionManager
+
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry()
+
+
+@pytest.fixture
+def global_registry():
+    REGISTRY.reset()
+    yield REGISTRY
+    REGISTRY.reset()
+
+
+def test_record_aggregates_calls(registry):
+    for seconds in (0.1, 0.2, 0.3):
+        registry.record("op", seconds, bytes_sent=10, bytes_received=5, retries=1)
+    stats = registry.snapshot()["op"]
+    assert stats["count"] == 3
+    assert stats["total_seconds"] == pytest.approx(0.6)
+    assert stats["max_seconds"] == 0.3
+    assert stats["p50_seconds"] == 0.2
+    assert stats["bytes_sent"] == 30
+    assert stats["retries"] == 3
+    assert registry.total_bytes() == 45
+
+
+def test_timer_records_failures_and_reraises(registry):
+    with pytest.raises(KeyError):
+        with registry.timer("phase"):
+            raise KeyError("missing")
+    stats = registry.get("phase")
+    assert stats.count == 1
+    assert stats.errors == 1
+    assert "missing" in stats.last_error
+
+
+def test_instrument_client_records_s3_latency_and_bytes(
+    mocked_aws, s3_client, s3_bucket, model_bucket, registry
+):
+    instrument_client(s3_client, registry)
+    s3_client.upload_fileobj(io.BytesIO(b"x" * 300), model_bucket, "key")
+    s3_client.download_fileobj(model_bucket, "key", io.BytesIO())
+    put = registry.get("s3.PutObject")
+    get = registry.get("s3.GetObject")
+    assert put.count == 1 and put.bytes_sent == 300
+    assert get.count == 1 and get.bytes_received == 300
+    assert put.total_seconds > 0
+
+
+def test_instrument_client_is_idempotent(mocked_aws, ssm_client, registry):
+    instrument_client(instrument_client(ssm_client, registry), registry)
+    ssm_client.describe_parameters()
+    assert registry.get("ssm.DescribeParameters").count == 1
+
+
+def test_instrument_client_records_errors(mocked_aws, ssm_client, registry):
+    instrument_client(ssm_client, registry)
+    with pytest.raises(ssm_client.exceptions.ParameterNotFound):
+        ssm_client.get_parameter(Name="missing")
+    stats = registry.get("ssm.GetParameter")
+    assert stats.errors == 1
+    assert stats.last_error == "ParameterNotFound"
+
+
+def test_instrument_client_records_throttles(aws_credentials, registry):
+    client = instrument_client(boto3.client("ssm", region_name="eu-west-2"), registry)
+    with Stubber(client) as stubber:
+        stubber.add_client_error(
+            "get_parameter", service_error_code="ThrottlingException"
+        )
+        with pytest.raises(client.exceptions.ClientError):
+            client.get_parameter(Name="p")
+    assert registry.get("ssm.GetParameter").throttles == 1
+
+
+def test_utilities_clients_and_phases_are_instrumented(
+    mocked_aws,
+    glue_table_simple,
+    s3_bucket,
+    ssm_parameter,
+    model_bucket,
+    global_registry,
+):
+    GlueSchemaReader("test-db").get_polars_schema("test-table-simple")
+    manager = ModelVersionManager(model_bucket, "model/test", "model/test/version")
+    manager.save_model({"coef": [1.0]}, "5.6.7")
+    manager.load_model()
+    snapshot = global_registry.snapshot()
+    for name in (
+        "glue.GetTable",
+        "schema_reader.parse",
+        "ssm.GetParameter",
+        "version.parse_parameter",
+        "version.pickle",
+        "version.unpickle",
+        "s3.PutObject",
+        "s3.GetObject",
+    ):
+        assert snapshot[name]["count"] >= 1, name
+
+
+def test_export_writes_json_file(registry, tmp_path):
+    registry.record("op", 0.5)
+    path = tmp_path / "metrics.json"
+    registry.export(str(path))
+    assert json.loads(path.read_text())["op"]["count"] == 1
+
+
+def test_export_logs_structured_lines(registry, caplog):
+    registry.record("op", 0.5, error="Boom")
+    with caplog.at_level(logging.INFO, logger="utilities.instrumentation"):
+        registry.export()
+    line = json.loads(caplog.records[0].getMessage())
+    assert line["metric"] == "op"
+    assert line["errors"] == 1
@@ -0,0 +1,153 @@
+import pytest
+import matplotlib
+
+matplotlib.use("Agg")
+
+import numpy as np
+import polars as pl
+import matplotlib.pyplot as plt
+from sklearn.linear_model import LinearRegression
+from utilities.plotting import (
+    bin_xy,
+    linear_coefficients,
+    plot_binned_regression,
+    stratified_points,
+)
+
+
+@pytest.fixture
+def regression_lf():
+    rng = np.random.default_rng(1)
+    n = 20000
+    x = rng.uniform(0, 30, n)
+    return pl.LazyFrame(
+        {
+            "MeanDailyTemperature": x,
+            "IceCreamSales": 20 * x + 100 + rng.normal(0, 10, n),
+            "careHome": rng.choice(["Y", "N"], n),
+        }
+    )
+
+
+@pytest.fixture
+def fitted_model(regression_lf):
+    df = regression_lf.collect()
+    model = LinearRegression()
+    model.fit(df[["MeanDailyTemperature"]].to_numpy(), df["IceCreamSales"].to_numpy())
+    return model
+
+
+def test_bin_xy_matches_numpy_histogram(regression_lf):
+    df = regression_lf.collect()
+    binned = bin_xy(
+        regression_lf,
+        "MeanDailyTemperature",
+        "IceCreamSales",
+        bins=(20, 10),
+        x_range=(0, 30),
+        y_range=(0, 800),
+    )
+    expected, _, _ = np.histogram2d(
+        df["IceCreamSales"].to_numpy(),
+        df["MeanDailyTemperature"].to_numpy(),
+        bins=(10, 20),
+        range=((0, 800), (0, 30)),
+    )
+    assert binned.counts.shape == (10, 20)
+    np.testing.assert_array_equal(binned.counts, expected)
+
+
+def test_bin_xy_infers_range_and_counts_every_row(regression_lf):
+    binned = bin_xy(regression_lf, "MeanDailyTemperature", "IceCreamSales", bins=15)
+    assert binned.counts.sum() == 20000
+    assert len(binned.x_edges) == 16
+
+
+def test_bin_xy_drops_nulls_and_handles_constant_column():
+    lf = pl.LazyFrame({"a": [1.0, 1.0, None], "b": [2.0, 3.0, 4.0]})
+    binned = bin_xy(lf, "a", "b", bins=4)
+    assert binned.counts.sum() == 2
+
+
+def test_bin_xy_drops_nan_and_infinite_values():
+    lf = pl.LazyFrame(
+        {
+            "a": [0.0, 1.0, float("nan"), 2.0, 3.0],
+            "b": [0.0, float("inf"), 1.0, 2.0, -float("inf")],
+        }
+    )
+    binned = bin_xy(lf, "a", "b", bins=2)
+    assert binned.counts.sum() == 2
+    np.testing.assert_array_equal(binned.x_edges, [0.0, 1.0, 2.0])
+    ax = plot_binned_regression(lf, "a", "b", bins=2, sample_size=5)
+    offsets = ax.collections[-1].get_offsets()
+    assert len(offsets) == 2 and np.isfinite(offsets).all()
+    plt.close(ax.figure)
+
+
+def test_bin_xy_rejects_zero_width_range():
+    lf = pl.LazyFrame({"a": [0.0, 1.0], "b": [0.0, 1.0]})
+    with pytest.raises(ValueError, match="x_range must have a positive width"):
+        bin_xy(lf, "a", "b", x_range=(0, 0))
+    with pytest.raises(ValueError, match="y_range"):
+        bin_xy(lf, "a", "b", y_range=(1, 0))
+
+
+@pytest.mark.parametrize("kind", ["hist2d", "hexbin"])
+def test_plot_binned_regression_without_finite_rows_draws_empty_axes(kind):
+    lf = pl.LazyFrame({"a": [float("nan"), None], "b": [1.0, 2.0]})
+    ax = plot_binned_regression(lf, "a", "b", kind=kind, bins=5, sample_size=3)
+    assert not ax.collections
+    assert ax.get_xlabel() == "a"
+    plt.close(ax.figure)
+
+
+def test_linear_coefficients(fitted_model):
+    slope, intercept = linear_coefficients(fitted_model)
+    assert slope == pytest.approx(20, rel=0.01)
+    assert intercept == pytest.approx(100, rel=0.05)
+
+
+def test_stratified_points_takes_n_per_stratum(regression_lf):
+    sample = stratified_points(
+        regression_lf, ["MeanDailyTemperature"], 5, stratify_by="careHome", seed=3
+    )
+    assert sample.height == 10
+    assert sample["careHome"].value_counts()["count"].to_list() == [5, 5]
+
+
+@pytest.mark.parametrize("kind", ["hist2d", "hexbin"])
+def test_plot_binned_regression_draws_density_line_and_sample(
+    regression_lf, fitted_model, kind
+):
+    ax = plot_binned_regression(
+        regression_lf,
+        "MeanDailyTemperature",
+        "IceCreamSales",
+        model=fitted_model,
+        kind=kind,
+        bins=30,
+        sample_size=25,
+        stratify_by="careHome",
+    )
+    assert len(ax.collections[-1].get_offsets()) == 50
+    assert ax.get_lines()[0].get_label() == "Regression Line"
+    plt.close(ax.figure)
+
+
+def test_plot_binned_regression_residuals(regression_lf, fitted_model):
+    ax = plot_binned_regression(
+        regression_lf,
+        "MeanDailyTemperature",
+        "IceCreamSales",
+        model=fitted_model,
+        residuals=True,
+    )
+    assert ax.get_ylabel() == "IceCreamSales residual"
+    assert list(ax.get_lines()[0].get_ydata()) == [0, 0]
+    plt.close(ax.figure)
+
+
+def test_plot_binned_regression_residuals_require_model(regression_lf):
+    with pytest.raises(ValueError, match="A model is required"):
+        plot_binned_regression(regression_lf, "a", "b", residuals=True)
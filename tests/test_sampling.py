@@ -0,0 +1,80 @@
+import pytest
+import numpy as np
+import polars as pl
+from utilities.sampling import (
+    bernoulli_sample,
+    reservoir_sample,
+    stratified_sample,
+    train_test_split,
+)
+
+
+@pytest.fixture
+def locations_lf():
+    rng = np.random.default_rng(3)
+    n = 10000
+    return pl.LazyFrame(
+        {
+            "locationId": np.arange(n) % 2000,
+            "careHome": rng.choice(["Y", "N"], n, p=[0.95, 0.05]),
+            "import_date": rng.choice(["20240101", "20240201", "20240301"], n),
+            "posts": rng.uniform(0, 100, n),
+        }
+    )
+
+
+def test_bernoulli_sample_is_lazy_reproducible_and_sized(locations_lf):
+    sample = bernoulli_sample(locations_lf, 0.1, seed=7)
+    assert isinstance(sample, pl.LazyFrame)
+    first = sample.collect(engine="streaming")
+    assert first.columns == locations_lf.collect_schema().names()
+    assert 850 < first.height < 1150
+    assert first.equals(bernoulli_sample(locations_lf, 0.1, seed=7).collect())
+    assert not first.equals(bernoulli_sample(locations_lf, 0.1, seed=8).collect())
+
+
+def test_bernoulli_sample_by_key_keeps_entities_together(locations_lf):
+    sample = bernoulli_sample(locations_lf, 0.2, key="locationId").collect()
+    counts = sample.group_by("locationId").len()
+    assert counts["len"].unique().to_list() == [5]
+
+
+def test_reservoir_sample_returns_exactly_n(locations_lf):
+    sample = reservoir_sample(locations_lf, 250, seed=1).collect(engine="streaming")
+    assert sample.height == 250
+    assert sample.equals(reservoir_sample(locations_lf, 250, seed=1).collect())
+    assert reservoir_sample(locations_lf.head(10), 250).collect().height == 10
+
+
+def test_stratified_sample_by_n_keeps_rare_strata(locations_lf):
+    sample = stratified_sample(
+        locations_lf, ["careHome", "import_date"], n=20, seed=2
+    ).collect(engine="streaming")
+    assert sample.columns == locations_lf.collect_schema().names()
+    counts = sample.group_by("careHome", "import_date").len()
+    assert counts.height == 6
+    assert counts["len"].unique().to_list() == [20]
+
+
+def test_stratified_sample_by_fraction_is_proportional(locations_lf):
+    full = locations_lf.group_by("careHome").len().collect()
+    sample = stratified_sample(locations_lf, "careHome", fraction=0.1).collect()
+    counts = sample.group_by("careHome").len().join(full, on="careHome")
+    for size, total in counts.select("len", "len_right").iter_rows():
+        assert size == int(np.ceil(total * 0.1))
+
+
+def test_stratified_sample_requires_one_of_n_or_fraction(locations_lf):
+    with pytest.raises(ValueError, match="exactly one"):
+        stratified_sample(locations_lf, "careHome")
+    with pytest.raises(ValueError, match="exactly one"):
+        stratified_sample(locations_lf, "careHome", n=1, fraction=0.1)
+    with pytest.raises(ValueError, match="between 0 and 1"):
+        bernoulli_sample(locations_lf, 1.5)
+
+
+def test_train_test_split_is_complementary(locations_lf):
+    train, test = train_test_split(locations_lf, 0.25, seed=4, key="locationId")
+    train_df, test_df = train.collect(), test.collect()
+    assert train_df.height + test_df.height == 10000
+    assert set(train_df["locationId"]).isdisjoint(test_df["locationId"])
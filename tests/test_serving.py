@@ -0,0 +1,164 @@
+import json
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+import numpy as np
+from sklearn.linear_model import LinearRegression
+from utilities.serving import PredictionServer, PredictionService
+from utilities.version import ModelVersionManager
+
+
+def _linear_model(slope, intercept):
+    x = np.arange(10, dtype=float).reshape(-1, 1)
+    return LinearRegression().fit(x, slope * x.ravel() + intercept)
+
+
+@pytest.fixture
+def manager(mocked_aws, s3_bucket, ssm_client, model_bucket):
+    manager = ModelVersionManager(model_bucket, "models/serving", "models/serving")
+    manager.save_model(_linear_model(2, 1), "1.0.0")
+    manager.update_parameter_store("1.0.0")
+    return manager
+
+
+@pytest.fixture
+def service(manager):
+    service = PredictionService(manager, max_batch_size=64, max_wait_ms=20)
+    service.start()
+    yield service
+    service.stop()
+
+
+@pytest.fixture
+def server(manager):
+    server = PredictionServer(
+        PredictionService(manager, max_wait_ms=20), port=0
+    ).start()
+    yield server
+    server.stop()
+
+
+def _post(url, payload):
+    request = urllib.request.Request(
+        url,
+        data=json.dumps(payload).encode(),
+        headers={"Content-Type": "application/json"},
+    )
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_predict_returns_predictions_and_version(service):
+    predictions, version = service.predict([[1.0], [2.0]])
+    assert predictions == pytest.approx([3.0, 5.0])
+    assert version == "1.0.0"
+
+
+def test_predict_requires_a_running_service(manager):
+    service = PredictionService(manager)
+    with pytest.raises(RuntimeError, match="not running"):
+        service.predict([[1.0]], timeout=1)
+    service.start()
+    assert service.predict([[1.0]], timeout=5)[0] == pytest.approx([3.0])
+    service.stop()
+    with pytest.raises(RuntimeError, match="not running"):
+        service.predict([[1.0]], timeout=1)
+    assert service._queue.empty()
+
+
+def test_predict_rejects_wrong_feature_count(service):
+    with pytest.raises(ValueError, match="Expected rows of 1 features"):
+        service.predict([[1.0, 2.0]])
+
+
+def test_concurrent_requests_are_coalesced(service):
+    with ThreadPoolExecutor(max_workers=32) as pool:
+        results = list(pool.map(lambda i: service.predict([[float(i)]]), range(128)))
+    for i, (predictions, _) in enumerate(results):
+        assert predictions == pytest.approx([2 * i + 1])
+    stats = service.stats()
+    assert stats["requests"] == 128
+    assert stats["batches"] < 128
+    assert stats["p99_ms"] >= stats["p50_ms"] > 0
+    assert stats["throughput_rps"] > 0
+
+
+def test_reload_swaps_model_without_dropping_requests(service, manager):
+    manager.save_model(_linear_model(10, 0), "1.1.0")
+
+    def request(i):
+        if i == 50:
+            manager.update_parameter_store("1.1.0")
+            service.reload()
+        return service.predict([[1.0]])
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = list(pool.map(request, range(100)))
+
+    for predictions, version in results:
+        expected = 3.0 if version == "1.0.0" else 10.0
+        assert predictions == pytest.approx([expected])
+    assert results[-1][1] == "1.1.0"
+    assert service.reload() is False
+
+
+def test_poll_loop_picks_up_new_version(manager):
+    service = PredictionService(manager, poll_interval=0.05).start()
+    try:
+        manager.save_model(_linear_model(10, 0), "2.0.0")
+        manager.update_parameter_store("2.0.0")
+        for _ in range(100):
+            if service.version == "2.0.0":
+                break
+            time.sleep(0.05)
+        assert service.predict([[1.0]]) == (pytest.approx([10.0]), "2.0.0")
+    finally:
+        service.stop()
+
+
+def test_http_server_predict_metrics_and_health(server):
+    status, body = _post(f"{server.url}/predict", {"instances": [[0.0], [4.0]]})
+    assert status == 200
+    assert body == {"predictions": pytest.approx([1.0, 9.0]), "version": "1.0.0"}
+
+    status, body = _post(f"{server.url}/predict", {"rows": [[0.0]]})
+    assert status == 400
+
+    with urllib.request.urlopen(f"{server.url}/metrics") as response:
+        metrics = json.loads(response.read())
+    assert metrics["requests"] == 1
+    with urllib.request.urlopen(f"{server.url}/health") as response:
+        assert json.loads(response.read()) == {"version": "1.0.0"}
+
+
+def test_predict_rejects_non_finite_rows(service):
+    with pytest.raises(ValueError, match="NaN or infinite"):
+        service.predict([[float("nan")]])
+    assert service.predict([[1.0]])[0] == pytest.approx([3.0])
+
+
+def test_failing_request_does_not_fail_its_batch(service):
+    model = service._current[1]
+    original_predict = model.predict
+
+    def predict(x):
+        if (x < 0).any():
+            raise ValueError("Negative input")
+        return original_predict(x)
+
+    model.predict = predict
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        futures = [
+            pool.submit(service.predict, [[-1.0 if i == 7 else float(i)]])
+            for i in range(16)
+        ]
+    for i, future in enumerate(futures):
+        if i == 7:
+            with pytest.raises(ValueError, match="Negative input"):
+                future.result()
+        else:
+            assert future.result()[0] == pytest.approx([2 * i + 1])
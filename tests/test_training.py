@@ -0,0 +1,159 @@
+import pytest
+from unittest.mock import Mock
+import numpy as np
+import polars as pl
+from sklearn.linear_model import LinearRegression
+from utilities.experiments import ExperimentStore
+from utilities.training import SegmentTrainer, fit_segment, segment_path
+
+
+@pytest.fixture
+def segmented_lf():
+    rng = np.random.default_rng(3)
+    frames = []
+    for care_home, slope in (("Y", 2.0), ("N", 5.0)):
+        x = rng.uniform(0, 10, 200)
+        frames.append(
+            pl.DataFrame(
+                {
+                    "careHome": care_home,
+                    "beds": x,
+                    "posts": slope * x + 1 + rng.normal(0, 0.1, 200),
+                }
+            )
+        )
+    broken = pl.DataFrame({"careHome": "broken", "beds": [1.0, 2.0], "posts": None})
+    return pl.concat(frames + [broken], how="vertical_relaxed").lazy()
+
+
+@pytest.fixture
+def trainer(mocked_aws, s3_bucket, model_bucket):
+    return SegmentTrainer(
+        s3_bucket=model_bucket,
+        s3_prefix="models/posts",
+        param_store_name="models/posts/version",
+        max_workers=2,
+    )
+
+
+def test_segment_path_is_safe_for_s3_and_ssm():
+    assert segment_path({"careHome": "Y", "region": "North East"}) == (
+        "careHome_Y/region_North_East"
+    )
+    assert segment_path({"careHome": None}) == "careHome_null"
+
+
+def test_fit_segment_returns_model_and_metrics():
+    x = np.arange(10, dtype=float).reshape(-1, 1)
+    model, metrics = fit_segment(LinearRegression, x, 3 * x.ravel())
+    assert model.coef_[0] == pytest.approx(3)
+    assert metrics["r2"] == pytest.approx(1)
+    assert metrics["fit_seconds"] >= 0
+
+
+def test_train_publishes_each_segment_and_reports_failures(
+    trainer, segmented_lf, s3_client, ssm_client, model_bucket
+):
+    results = {
+        r.segment["careHome"]: r
+        for r in trainer.train(segmented_lf, "careHome", ["beds"], "posts")
+    }
+
+    assert set(results) == {"Y", "N", "broken"}
+    assert not results["broken"].succeeded
+    assert "NaN" in results["broken"].error
+    for care_home, slope in (("Y", 2.0), ("N", 5.0)):
+        result = results[care_home]
+        assert result.succeeded
+        assert result.version == "0.1.0"
+        assert result.n_rows == 200
+        assert result.metrics["r2"] > 0.99
+        manager = trainer.version_manager(result.path)
+        assert manager.get_current_version() == "0.1.0"
+        assert manager.load_model().coef_[0] == pytest.approx(slope, rel=0.01)
+
+    keys = [
+        obj["Key"] for obj in s3_client.list_objects_v2(Bucket=model_bucket)["Contents"]
+    ]
+    assert sorted(keys) == [
+        "models/posts/careHome_N/0.1.0/model.pkl",
+        "models/posts/careHome_Y/0.1.0/model.pkl",
+    ]
+
+
+def test_train_fails_segments_that_share_a_path(trainer, s3_client, model_bucket):
+    lf = pl.LazyFrame(
+        {
+            "region": ["North East", "North_East", "South"] * 10,
+            "beds": np.arange(30, dtype=float),
+            "posts": np.arange(30, dtype=float) * 2,
+        }
+    )
+    results = {
+        r.segment["region"]: r for r in trainer.train(lf, "region", ["beds"], "posts")
+    }
+
+    assert results["South"].succeeded
+    for region in ("North East", "North_East"):
+        assert results[region].version is None
+        assert "shared by 2 segments" in results[region].error
+    keys = [
+        obj["Key"] for obj in s3_client.list_objects_v2(Bucket=model_bucket)["Contents"]
+    ]
+    assert keys == ["models/posts/region_South/0.1.0/model.pkl"]
+
+
+def test_train_increments_existing_segment_versions(trainer, segmented_lf):
+    trainer.train(segmented_lf, ["careHome"], ["beds"], "posts")
+    results = trainer.train(segmented_lf, ["careHome"], ["beds"], "posts")
+    versions = {r.segment["careHome"]: r.version for r in results}
+    assert versions == {"Y": "0.2.0", "N": "0.2.0", "broken": None}
+
+
+def test_train_records_runs_in_experiment_store(
+    mocked_aws, s3_bucket, ssm_client, model_bucket, segmented_lf, tmp_path
+):
+    store = ExperimentStore(str(tmp_path / "experiments"))
+    trainer = SegmentTrainer(
+        s3_bucket=model_bucket,
+        s3_prefix="models/posts",
+        param_store_name="models/posts/version",
+        max_workers=2,
+        experiment_store=store,
+    )
+    trainer.train(segmented_lf, "careHome", ["beds"], "posts")
+
+    best = store.best_runs(model_name="models/posts/version")
+    assert best["segment"].to_list() == ["careHome_N", "careHome_Y"]
+    assert best["r2"].min() > 0.99
+    assert best["n_train_rows"].to_list() == [200, 200]
+    assert best["artifact_key"].to_list() == [
+        "models/posts/careHome_N/0.1.0/model.pkl",
+        "models/posts/careHome_Y/0.1.0/model.pkl",
+    ]
+    assert best["dataset_fingerprint"].n_unique() == 1
+    assert len(list((tmp_path / "experiments").rglob("*.parquet"))) == 1
+
+
+def test_experiment_log_failure_does_not_fail_published_segment(
+    mocked_aws, s3_bucket, ssm_client, model_bucket, segmented_lf, tmp_path
+):
+    store = ExperimentStore(str(tmp_path / "experiments"))
+    store.record = Mock(side_effect=OSError("disk full"))
+    trainer = SegmentTrainer(
+        s3_bucket=model_bucket,
+        s3_prefix="models/posts",
+        param_store_name="models/posts/version",
+        max_workers=2,
+        experiment_store=store,
+    )
+    results = {
+        r.segment["careHome"]: r
+        for r in trainer.train(segmented_lf, "careHome", ["beds"], "posts")
+    }
+
+    assert results["Y"].succeeded
+    assert results["Y"].version == "0.1.0"
+    assert results["Y"].log_error == "OSError: disk full"
+    parameter = ssm_client.get_parameter(Name="models/posts/version/careHome_Y")
+    assert "0.1.0" in parameter["Parameter"]["Value"]
@@ -1,7 +1,9 @@
 import pytest
 from unittest.mock import Mock, patch
+from utilities.experiments import ExperimentStore
 from utilities.version import ModelVersionManager, EnumChangeType, BaseEstimator
 import pickle
+import json
 import io
 
 
@@ -142,9 +144,41 @@ def test_prompt_and_save_success(
     mock_update.assert_called_with("1.3.0")
 
 
+@patch("builtins.input", side_effect=["yes", "3"])
+def test_prompt_and_save_records_run(mock_input, version_manager, tmp_path):
+    version_manager.experiment_store = ExperimentStore(str(tmp_path))
+    model = DummyModel(version="1", param1=2, param2=3)
+    version_manager.prompt_and_save(model, metrics={"r2": 0.9}, n_train_rows=50)
+    run = version_manager.experiment_store.scan().collect().row(0, named=True)
+    assert run["version"] == version_manager.get_current_version()
+    assert run["model_name"] == "model/test/version"
+    assert json.loads(run["params"]) == {"param1": 2, "param2": 3, "version": "1"}
+    assert run["n_train_rows"] == 50
+
+
 @patch("builtins.input", side_effect=["no"])
 @patch(f"{PATCH_STEM}.get_new_version")
 def test_prompt_and_save_no_save(mock_get_new, mock_input, mocked_aws, version_manager):
     mock_model = Mock()
     version_manager.prompt_and_save(mock_model)
     mock_get_new.assert_not_called()
+
+
+def test_save_artifact_round_trip(mocked_aws, version_manager, model_bucket):
+    key = version_manager.save_artifact(b"payload", "1.2.3", "extra.json")
+    assert key == "model/test/version/1.2.3/extra.json"
+    assert version_manager.load_artifact("1.2.3", "extra.json") == b"payload"
+
+
+def test_load_model_reads_given_version(mocked_aws, version_manager, fitted_model):
+    version_manager.save_model(fitted_model, "1.2.3")
+    loaded_model = version_manager.load_model("1.2.3")
+    assert loaded_model.param1 == 17
+    assert loaded_model.param2 == 26
+
+
+def test_load_model_defaults_to_current_version(
+    mocked_aws, version_manager, fitted_model
+):
+    version_manager.save_model(fitted_model, "5.6.7")
+    assert version_manager.load_model().version == "1.2.3"
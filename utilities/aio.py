@@ -0,0 +1,240 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, TypeVar
+
+from botocore.config import Config
+from polars import DataType
+from sklearn.base import BaseEstimator
+
+from utilities.schema_reader import GlueSchemaReader
+from utilities.version import ChangeType, ModelVersionManager
+
+DEFAULT_MAX_CONCURRENCY = 32
+
+T = TypeVar("T")
+W = TypeVar("W", bound="_AsyncWrapper")
+
+
+class AsyncRunner:
+    """
+    Runs blocking calls on a bounded thread pool so they can be awaited without
+    blocking the event loop.
+
+    The pool size is the concurrency limit: at most ``max_concurrency`` calls
+    are in flight and the rest wait their turn. A runner can be shared by many
+    async readers and managers to bound their combined concurrency.
+    """
+
+    def __init__(self, max_concurrency: int = DEFAULT_MAX_CONCURRENCY) -> None:
+        self.max_concurrency = max_concurrency
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="utilities-aio"
+        )
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Runs a blocking function on the pool and waits for its result.
+
+        Args:
+            fn (Callable[..., T]): The blocking function.
+            *args (Any): Positional arguments for the function.
+            **kwargs (Any): Keyword arguments for the function.
+
+        Returns:
+            T: The function's return value.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(fn, *args, **kwargs)
+        )
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    async def __aenter__(self) -> "AsyncRunner":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        # Waiting for in-flight calls would otherwise block the event loop.
+        await asyncio.to_thread(self.close)
+
+
+class _AsyncWrapper:
+    def __init__(self, max_concurrency: int, runner: Optional[AsyncRunner]) -> None:
+        self._owns_runner = runner is None
+        self.runner = runner or AsyncRunner(max_concurrency)
+        self.client_config = Config(max_pool_connections=self.runner.max_concurrency)
+
+    def close(self) -> None:
+        """Shuts down the thread pool, unless it was shared with this object."""
+        if self._owns_runner:
+            self.runner.close()
+
+    async def __aenter__(self: W) -> W:
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        # Waiting for in-flight calls would otherwise block the event loop.
+        await asyncio.to_thread(self.close)
+
+
+class AsyncGlueSchemaReader(_AsyncWrapper):
+    """
+    Asyncio counterpart of GlueSchemaReader.
+
+    Each call runs the synchronous reader on the runner's thread pool, so both
+    the Glue request and the type parsing stay off the event loop and behave
+    exactly as in the synchronous reader.
+    """
+
+    def __init__(
+        self,
+        database_name: str,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        runner: Optional[AsyncRunner] = None,
+    ) -> None:
+        super().__init__(max_concurrency, runner)
+        self.reader = GlueSchemaReader(database_name, client_config=self.client_config)
+
+    async def get_polars_schema(self, table_name: str) -> Dict[str, DataType]:
+        """
+        Converts a Glue table schema into a Polars schema dictionary.
+
+        Args:
+            table_name (str): The name of the table within the database.
+
+        Returns:
+            Dict[str, DataType]: The Polars schema.
+        """
+        return await self.runner.run(self.reader.get_polars_schema, table_name)
+
+    async def get_polars_schemas(
+        self, table_names: Sequence[str]
+    ) -> Dict[str, Dict[str, DataType]]:
+        """
+        Fetches and converts many table schemas concurrently.
+
+        Args:
+            table_names (Sequence[str]): The names of the tables within the database.
+
+        Returns:
+            Dict[str, Dict[str, DataType]]: The Polars schema of each table.
+        """
+        schemas = await asyncio.gather(
+            *(self.get_polars_schema(name) for name in table_names)
+        )
+        return dict(zip(table_names, schemas))
+
+
+class AsyncModelVersionManager(_AsyncWrapper):
+    """
+    Asyncio counterpart of ModelVersionManager.
+
+    Each call runs the synchronous manager on the runner's thread pool, so the
+    AWS requests as well as pickling and unpickling stay off the event loop.
+    """
+
+    def __init__(
+        self,
+        s3_bucket: str,
+        s3_prefix: str,
+        param_store_name: str,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        runner: Optional[AsyncRunner] = None,
+    ) -> None:
+        super().__init__(max_concurrency, runner)
+        self.manager = ModelVersionManager(
+            s3_bucket, s3_prefix, param_store_name, client_config=self.client_config
+        )
+
+    async def get_current_version(self) -> str:
+        """
+        Retrieves the current model version from Parameter Store.
+
+        Returns:
+            str: The current version string (e.g., "1.2.3").
+        """
+        return await self.runner.run(self.manager.get_current_version)
+
+    async def get_new_version(self, change_type: ChangeType) -> str:
+        """
+        Calculates and returns the new version number.
+
+        Args:
+            change_type (ChangeType): 'MAJOR', 'MINOR', or 'PATCH'.
+
+        Returns:
+            str: The new version string.
+        """
+        return await self.runner.run(self.manager.get_new_version, change_type)
+
+    async def update_parameter_store(self, new_version: str) -> None:
+        """
+        Updates the version number in Parameter Store.
+
+        Args:
+            new_version (str): The new version string.
+        """
+        await self.runner.run(self.manager.update_parameter_store, new_version)
+
+    async def list_versions(self) -> List[str]:
+        """
+        Lists the versions saved under the S3 prefix, oldest first.
+
+        Returns:
+            List[str]: The version strings in semantic version order.
+        """
+        return await self.runner.run(self.manager.list_versions)
+
+    async def save_model(self, model: BaseEstimator, new_version: str) -> None:
+        """
+        Saves the trained model to S3 with the version number in the path.
+
+        Args:
+            model (BaseEstimator): The trained model object to be saved.
+            new_version (str): The new version string.
+        """
+        await self.runner.run(self.manager.save_model, model, new_version)
+
+    async def load_model(self, version: Optional[str] = None) -> BaseEstimator:
+        """
+        Loads a trained model from S3.
+
+        Args:
+            version (Optional[str]): The version to load, defaults to the current
+                version in Parameter Store.
+
+        Returns:
+            BaseEstimator: The unpickled model.
+        """
+        return await self.runner.run(self.manager.load_model, version)
+
+    async def save_artifact(self, data: bytes, version: str, filename: str) -> str:
+        """
+        Saves an auxiliary artifact alongside the model for a given version.
+
+        Args:
+            data (bytes): The serialised artifact.
+            version (str): The model version the artifact belongs to.
+            filename (str): The file name to use under the version prefix.
+
+        Returns:
+            str: The S3 key the artifact was written to.
+        """
+        return await self.runner.run(
+            self.manager.save_artifact, data, version, filename
+        )
+
+    async def load_artifact(self, version: str, filename: str) -> bytes:
+        """
+        Loads an auxiliary artifact stored alongside the model for a given version.
+
+        Args:
+            version (str): The model version the artifact belongs to.
+            filename (str): The file name under the version prefix.
+
+        Returns:
+            bytes: The raw artifact contents.
+        """
+        return await self.runner.run(self.manager.load_artifact, version, filename)
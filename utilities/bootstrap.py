@@ -0,0 +1,321 @@
+import json
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import polars as pl
+
+from utilities.instrumentation import REGISTRY
+from utilities.version import ModelVersionManager
+
+BOOTSTRAP_FILENAME = "bootstrap.json"
+DEFAULT_CHUNK_SIZE = 10_000
+INTERCEPT = "intercept"
+
+
+@dataclass
+class BootstrapResult:
+    """
+    Bootstrap distribution of a linear model's coefficients.
+
+    Attributes:
+        terms (List[str]): The name of each coefficient, ``intercept`` first when
+            the model was fitted with one.
+        estimate (np.ndarray): The coefficients fitted on the full data, shape (k,).
+        draws (np.ndarray): The coefficients fitted on each resample, shape (B, k).
+        residuals (np.ndarray): A sample of full-data residuals, used to widen
+            confidence intervals into prediction intervals.
+        n_rows (int): The number of rows the model was fitted on.
+        seed (int): The seed the resample weights were drawn from.
+    """
+
+    terms: List[str]
+    estimate: np.ndarray
+    draws: np.ndarray
+    residuals: np.ndarray
+    n_rows: int
+    seed: int
+
+    @property
+    def fit_intercept(self) -> bool:
+        return bool(self.terms) and self.terms[0] == INTERCEPT
+
+    @property
+    def features(self) -> List[str]:
+        return self.terms[1:] if self.fit_intercept else list(self.terms)
+
+    def coefficient_intervals(self, alpha: float = 0.05) -> pl.DataFrame:
+        """
+        Summarises each coefficient with its percentile interval.
+
+        Args:
+            alpha (float): One minus the interval coverage.
+
+        Returns:
+            pl.DataFrame: One row per term with its estimate, bootstrap standard
+                error and lower and upper bounds.
+        """
+        lower, upper = np.nanquantile(self.draws, [alpha / 2, 1 - alpha / 2], axis=0)
+        return pl.DataFrame(
+            {
+                "term": self.terms,
+                "estimate": self.estimate,
+                "std_error": np.nanstd(self.draws, axis=0, ddof=1),
+                "lower": lower,
+                "upper": upper,
+            }
+        )
+
+    def prediction_intervals(
+        self,
+        x: Union[np.ndarray, pl.DataFrame],
+        alpha: float = 0.05,
+        kind: str = "prediction",
+        seed: int = 0,
+    ) -> pl.DataFrame:
+        """
+        Predicts with interval bounds for new rows.
+
+        Args:
+            x (Union[np.ndarray, pl.DataFrame]): The feature rows, in the order of
+                ``features``.
+            alpha (float): One minus the interval coverage.
+            kind (str): ``confidence`` for the uncertainty in the mean prediction,
+                or ``prediction`` to also include the residual noise of a single
+                new observation.
+            seed (int): The seed used to pair resamples with residuals.
+
+        Returns:
+            pl.DataFrame: The point prediction and its lower and upper bounds.
+
+        Raises:
+            ValueError: If the kind is unknown or the rows have the wrong width.
+        """
+        if kind not in ("confidence", "prediction"):
+            raise ValueError(f"Unknown interval kind: {kind}")
+        if isinstance(x, pl.DataFrame):
+            x = x.select(self.features).to_numpy()
+        design = _design_matrix(np.atleast_2d(np.asarray(x, dtype=float)), self)
+
+        simulated = design @ self.draws.T
+        if kind == "prediction" and self.residuals.size:
+            rng = np.random.default_rng(seed)
+            simulated = simulated + rng.choice(self.residuals, size=simulated.shape[1])
+        lower, upper = np.nanquantile(simulated, [alpha / 2, 1 - alpha / 2], axis=1)
+        return pl.DataFrame(
+            {"prediction": design @ self.estimate, "lower": lower, "upper": upper}
+        )
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "terms": self.terms,
+                "estimate": self.estimate.tolist(),
+                "draws": self.draws.tolist(),
+                "residuals": self.residuals.tolist(),
+                "n_rows": self.n_rows,
+                "seed": self.seed,
+            }
+        )
+
+    @classmethod
+    def from_json(cls, raw: Union[str, bytes]) -> "BootstrapResult":
+        data = json.loads(raw)
+        return cls(
+            terms=data["terms"],
+            estimate=np.asarray(data["estimate"], dtype=float),
+            draws=np.asarray(data["draws"], dtype=float).reshape(
+                -1, len(data["terms"])
+            ),
+            residuals=np.asarray(data["residuals"], dtype=float),
+            n_rows=data["n_rows"],
+            seed=data["seed"],
+        )
+
+    def save(self, version_manager: ModelVersionManager, version: str) -> str:
+        """
+        Stores the bootstrap draws alongside a model version.
+
+        Args:
+            version_manager (ModelVersionManager): The manager for the model.
+            version (str): The model version the draws belong to.
+
+        Returns:
+            str: The S3 key the draws were written to.
+        """
+        return version_manager.save_artifact(
+            self.to_json().encode("utf-8"), version, BOOTSTRAP_FILENAME
+        )
+
+    @classmethod
+    def load(
+        cls, version_manager: ModelVersionManager, version: str
+    ) -> "BootstrapResult":
+        """
+        Loads the bootstrap draws stored alongside a model version.
+
+        Args:
+            version_manager (ModelVersionManager): The manager for the model.
+            version (str): The model version to load the draws for.
+
+        Returns:
+            BootstrapResult: The stored draws.
+        """
+        return cls.from_json(version_manager.load_artifact(version, BOOTSTRAP_FILENAME))
+
+
+def bootstrap_linear_model(
+    lf: pl.LazyFrame,
+    features: Sequence[str],
+    target: str,
+    n_resamples: int = 1000,
+    fit_intercept: bool = True,
+    seed: int = 0,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_workers: Optional[int] = None,
+) -> BootstrapResult:
+    """
+    Bootstraps an ordinary least squares fit without refitting a model per
+    resample.
+
+    Each resample is a Poisson(1) weighting of the rows, which has the same
+    distribution as resampling with replacement but can be drawn independently
+    per row. Every resample's normal equations are then sums of the rows'
+    precomputed cross-products ``x xᵀ`` and ``x y``, so each chunk of rows
+    reduces to two matrix products (weights times cross-products) on the process
+    pool, and all resamples are solved together as one batched linear system.
+
+    The features are scaled to unit variance, and with an intercept the features
+    and target are also centred, before the cross-products are formed. This
+    keeps the normal equations well conditioned when a feature has a large
+    offset, such as a date stored as an integer. Coefficients are mapped back
+    to the original units afterwards.
+
+    Args:
+        lf (pl.LazyFrame): The training data.
+        features (Sequence[str]): The feature columns.
+        target (str): The target column.
+        n_resamples (int): The number of bootstrap resamples.
+        fit_intercept (bool): Whether to fit an intercept, as LinearRegression does.
+        seed (int): The seed for the resample weights. Results do not depend on
+            the number of workers.
+        chunk_size (int): The rows per work item. Each worker holds an
+            ``n_resamples`` by ``chunk_size`` weight matrix.
+        max_workers (Optional[int]): The process pool size.
+
+    Returns:
+        BootstrapResult: The full-data estimate and the resampled coefficients.
+
+    Raises:
+        ValueError: If there are no complete rows to fit on.
+    """
+    df = lf.select(list(features) + [target]).drop_nulls().collect()
+    if df.height == 0:
+        raise ValueError("No complete rows to fit the bootstrap on.")
+    terms = ([INTERCEPT] if fit_intercept else []) + list(features)
+    raw = df.select(features).to_numpy().astype(float)
+    y = df[target].to_numpy().astype(float)
+    x_shift = raw.mean(axis=0) if fit_intercept else np.zeros(raw.shape[1])
+    x_scale = raw.std(axis=0)
+    x_scale[x_scale == 0] = 1.0
+    y_shift = float(y.mean()) if fit_intercept else 0.0
+    x = (raw - x_shift) / x_scale
+    if fit_intercept:
+        x = np.column_stack([np.ones(len(x)), x])
+    y = y - y_shift
+    k = x.shape[1]
+
+    with REGISTRY.timer("bootstrap.cross_products"):
+        cross = (x[:, :, None] * x[:, None, :]).reshape(len(x), k * k)
+        moments = x * y[:, None]
+
+    starts = range(0, len(x), chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(starts))
+    xtx = np.zeros((n_resamples, k * k))
+    xty = np.zeros((n_resamples, k))
+    with REGISTRY.timer("bootstrap.weighted_sums"):
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = [
+                pool.submit(
+                    weighted_sums,
+                    cross[start : start + chunk_size],
+                    moments[start : start + chunk_size],
+                    n_resamples,
+                    chunk_seed,
+                )
+                for start, chunk_seed in zip(starts, seeds)
+            ]
+            for future in futures:
+                chunk_xtx, chunk_xty = future.result()
+                xtx += chunk_xtx
+                xty += chunk_xty
+
+    with REGISTRY.timer("bootstrap.solve"):
+        scaled_estimate = _solve(cross.sum(axis=0)[None], moments.sum(axis=0)[None], k)
+        residuals = y - x @ scaled_estimate[0]
+        estimate = _unscale(scaled_estimate, x_shift, x_scale, y_shift)[0]
+        draws = _unscale(_solve(xtx, xty, k), x_shift, x_scale, y_shift)
+
+    sample = np.random.default_rng(seed).choice(
+        residuals, size=min(len(residuals), n_resamples), replace=False
+    )
+    print(
+        f"Bootstrapped {n_resamples} resamples of {len(x)} rows "
+        f"in {len(starts)} chunks"
+    )
+    return BootstrapResult(terms, estimate, draws, sample, len(x), seed)
+
+
+def weighted_sums(
+    cross: np.ndarray, moments: np.ndarray, n_resamples: int, seed: Any
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Accumulates one chunk of rows into every resample's normal equations. Runs
+    in a worker process, so it must stay a module-level function.
+
+    Args:
+        cross (np.ndarray): The rows' flattened ``x xᵀ``, shape (m, k²).
+        moments (np.ndarray): The rows' ``x y``, shape (m, k).
+        n_resamples (int): The number of resamples.
+        seed (Any): The chunk's SeedSequence.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The chunk's weighted ``XᵀX`` (B, k²) and
+            ``Xᵀy`` (B, k) for every resample.
+    """
+    rng = np.random.default_rng(seed)
+    weights = rng.poisson(1.0, size=(n_resamples, len(cross))).astype(float)
+    return weights @ cross, weights @ moments
+
+
+def _solve(xtx: np.ndarray, xty: np.ndarray, k: int) -> np.ndarray:
+    """Solves a batch of normal equations, falling back to least squares for
+    resamples whose cross-product matrix is singular."""
+    a = xtx.reshape(-1, k, k)
+    try:
+        return np.linalg.solve(a, xty[..., None])[..., 0]
+    except np.linalg.LinAlgError:
+        return (np.linalg.pinv(a) @ xty[..., None])[..., 0]
+
+
+def _unscale(
+    solutions: np.ndarray, x_shift: np.ndarray, x_scale: np.ndarray, y_shift: float
+) -> np.ndarray:
+    """Maps coefficients fitted on centred and scaled data back to the original
+    units. Without an intercept the shifts are zero and only the scale applies."""
+    if solutions.shape[1] == len(x_scale):
+        return solutions / x_scale
+    coef = solutions[:, 1:] / x_scale
+    intercept = solutions[:, :1] + y_shift - coef @ x_shift[:, None]
+    return np.column_stack([intercept, coef])
+
+
+def _design_matrix(x: np.ndarray, result: BootstrapResult) -> np.ndarray:
+    if x.shape[1] != len(result.features):
+        raise ValueError(
+            f"Expected rows of {len(result.features)} features, got shape {x.shape}."
+        )
+    if result.fit_intercept:
+        return np.column_stack([np.ones(len(x)), x])
+    return x
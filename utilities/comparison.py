@@ -0,0 +1,240 @@
+import argparse
+from typing import Dict, List, Literal, Optional, Sequence
+
+import numpy as np
+import polars as pl
+from sklearn.base import BaseEstimator, is_classifier
+
+from utilities.compiler import compile_linear_model, is_logistic
+from utilities.instrumentation import REGISTRY
+from utilities.version import ModelVersionManager
+
+RankBy = Literal["rmse", "mae", "r2"]
+
+
+def resolve_versions(
+    version_manager: ModelVersionManager,
+    versions: Optional[Sequence[str]] = None,
+    last: Optional[int] = None,
+) -> List[str]:
+    """
+    Works out which versions to compare.
+
+    Args:
+        version_manager (ModelVersionManager): The manager the models were saved with.
+        versions (Optional[Sequence[str]]): Explicit versions to compare.
+        last (Optional[int]): Compare the latest ``last`` saved versions instead.
+
+    Returns:
+        List[str]: The versions to compare.
+
+    Raises:
+        ValueError: If not exactly one of ``versions`` and ``last`` is given,
+            ``last`` is less than 1, or no versions were found.
+    """
+    if (versions is None) == (last is None):
+        raise ValueError("Pass exactly one of `versions` or `last`.")
+    if versions is not None:
+        resolved = list(dict.fromkeys(versions))
+    else:
+        if last < 1:  # type: ignore[operator]
+            raise ValueError(f"`last` must be at least 1, got {last}.")
+        resolved = version_manager.list_versions()[-last:]  # type: ignore[operator]
+    if not resolved:
+        raise ValueError(
+            f"No model versions found under s3://{version_manager.s3_bucket}/"
+            f"{version_manager.s3_prefix}"
+        )
+    return resolved
+
+
+def prediction_expr(
+    model: BaseEstimator, features: Sequence[str], name: str
+) -> pl.Expr:
+    """
+    Builds an expression scoring a model on the feature columns.
+
+    Linear regressors and logistic classifiers are compiled into native Polars
+    arithmetic. Any other estimator, including margin classifiers such as
+    LinearSVC, is scored batch by batch with its own ``predict``.
+
+    Args:
+        model (BaseEstimator): The fitted model.
+        features (Sequence[str]): The feature columns, in training order.
+        name (str): The output column name.
+
+    Returns:
+        pl.Expr: An expression evaluating to the model's predictions.
+    """
+    if hasattr(model, "coef_") and (not is_classifier(model) or is_logistic(model)):
+        return compile_linear_model(model, features=features, name=name)
+
+    def predict(batch: pl.Series) -> pl.Series:
+        frame = batch.struct.unnest()
+        x = frame if hasattr(model, "feature_names_in_") else frame.to_numpy()
+        return pl.Series(np.asarray(model.predict(x), dtype=float))  # type: ignore[attr-defined]
+
+    return (
+        pl.struct(list(features))
+        .map_batches(predict, return_dtype=pl.Float64)
+        .alias(name)
+    )
+
+
+def compare_versions(
+    lf: pl.LazyFrame,
+    version_manager: ModelVersionManager,
+    target: str,
+    features: Optional[Sequence[str]] = None,
+    versions: Optional[Sequence[str]] = None,
+    last: Optional[int] = None,
+    rank_by: RankBy = "rmse",
+    output: Optional[str] = None,
+) -> pl.DataFrame:
+    """
+    Scores several model versions against the same evaluation data and ranks them.
+
+    Every model's predictions and error sums are built into a single query, so
+    the evaluation data is read once however many versions are compared.
+
+    Args:
+        lf (pl.LazyFrame): The scanned evaluation data.
+        version_manager (ModelVersionManager): The manager the models were saved with.
+        target (str): The target column.
+        features (Optional[Sequence[str]]): The feature columns, in training
+            order. Defaults to each model's own ``feature_names_in_``, so versions
+            trained on different features can be compared.
+        versions (Optional[Sequence[str]]): Explicit versions to compare.
+        last (Optional[int]): Compare the latest ``last`` saved versions instead.
+        rank_by (RankBy): The metric to rank by.
+        output (Optional[str]): A CSV path to write the comparison table to.
+
+    Returns:
+        pl.DataFrame: One row per version with its rank, n, r2, rmse and mae,
+            best first.
+    """
+    resolved = resolve_versions(version_manager, versions, last)
+    models = {v: version_manager.load_model(v) for v in resolved}
+    try:
+        current = version_manager.get_current_version()
+    except Exception:
+        current = None
+
+    with REGISTRY.timer("comparison.evaluate"):
+        sums = (
+            comparison_query(lf, models, target, features)
+            .collect(engine="streaming")
+            .row(0, named=True)
+        )
+    table = _comparison_table(sums, list(models), current, rank_by)
+
+    if output:
+        table.write_csv(output)
+        print(f"Saved comparison of {len(models)} versions to {output}")
+    return table
+
+
+def comparison_query(
+    lf: pl.LazyFrame,
+    models: Dict[str, BaseEstimator],
+    target: str,
+    features: Optional[Sequence[str]] = None,
+) -> pl.LazyFrame:
+    """
+    Builds one aggregation over the evaluation data holding the error sums of
+    every model, so all of them are scored from the same batches.
+
+    Args:
+        lf (pl.LazyFrame): The scanned evaluation data.
+        models (Dict[str, BaseEstimator]): The fitted models, keyed by version.
+        target (str): The target column.
+        features (Optional[Sequence[str]]): The feature columns, in training
+            order. Defaults to each model's own ``feature_names_in_``.
+
+    Returns:
+        pl.LazyFrame: A single-row frame with ``n``, ``ss_tot`` and per-version
+            ``{version}|ss_res`` and ``{version}|abs_res`` columns.
+    """
+    y = pl.col(target).cast(pl.Float64)
+    n = pl.len()
+    aggregations = [n.alias("n"), (y.var(ddof=0) * n).alias("ss_tot")]
+    columns: Dict[str, None] = {}
+    for i, (version, model) in enumerate(models.items()):
+        model_features = _model_features(model, features)
+        columns.update(dict.fromkeys(model_features))
+        residual = y - prediction_expr(model, model_features, f"__prediction_{i}")
+        aggregations += [
+            (residual**2).sum().alias(f"{version}|ss_res"),
+            residual.abs().sum().alias(f"{version}|abs_res"),
+        ]
+    return lf.select(list(columns) + [target]).drop_nulls().select(aggregations)
+
+
+def _model_features(
+    model: BaseEstimator, features: Optional[Sequence[str]]
+) -> List[str]:
+    if features is not None:
+        return list(features)
+    names = getattr(model, "feature_names_in_", None)
+    if names is None:
+        raise ValueError(
+            f"{type(model).__name__} was not fitted with feature names, "
+            "pass `features`."
+        )
+    return [str(n) for n in names]
+
+
+def _comparison_table(
+    sums: Dict[str, float], versions: List[str], current: Optional[str], rank_by: RankBy
+) -> pl.DataFrame:
+    n = sums["n"]
+    ss_tot = sums["ss_tot"]
+    rows = []
+    for version in versions:
+        ss_res = sums[f"{version}|ss_res"]
+        rows.append(
+            {
+                "version": version,
+                "current": version == current,
+                "n": n,
+                "r2": 1 - ss_res / ss_tot if ss_tot else float("nan"),
+                "rmse": float(np.sqrt(ss_res / n)) if n else float("nan"),
+                "mae": sums[f"{version}|abs_res"] / n if n else float("nan"),
+            }
+        )
+    return (
+        pl.DataFrame(rows)
+        .sort(rank_by, descending=rank_by == "r2", nulls_last=True)
+        .with_row_index("rank", offset=1)
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare model versions on one scan of an evaluation dataset."
+    )
+    parser.add_argument("--bucket", required=True)
+    parser.add_argument("--prefix", required=True)
+    parser.add_argument("--param", required=True)
+    parser.add_argument("--data", required=True, help="Parquet path or glob.")
+    parser.add_argument("--features", nargs="+")
+    parser.add_argument("--target", required=True)
+    selection = parser.add_mutually_exclusive_group(required=True)
+    selection.add_argument("--versions", nargs="+")
+    selection.add_argument("--last", type=int)
+    parser.add_argument("--rank-by", choices=["rmse", "mae", "r2"], default="rmse")
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    comparison = compare_versions(
+        pl.scan_parquet(args.data),
+        ModelVersionManager(args.bucket, args.prefix, args.param),
+        args.target,
+        features=args.features,
+        versions=args.versions,
+        last=args.last,
+        rank_by=args.rank_by,
+        output=args.output,
+    )
+    with pl.Config(tbl_rows=-1):
+        print(comparison)
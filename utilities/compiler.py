@@ -0,0 +1,177 @@
+from functools import reduce
+from typing import List, Literal, Optional, Sequence, Tuple
+
+import numpy as np
+import polars as pl
+from sklearn.base import BaseEstimator, is_classifier
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+
+from utilities.version import ModelVersionManager
+
+Link = Literal["identity", "log", "logit"]
+
+# Inverse links of sklearn's GLM losses, keyed by the link class name.
+GLM_LINKS = {"IdentityLink": "identity", "LogLink": "log", "LogitLink": "logit"}
+
+
+def compile_linear_model(
+    model: BaseEstimator,
+    features: Optional[Sequence[str]] = None,
+    link: Optional[Link] = None,
+    clip: Optional[Tuple[Optional[float], Optional[float]]] = None,
+    name: str = "prediction",
+) -> pl.Expr:
+    """
+    Compiles a fitted linear-family estimator into a Polars expression, so it can
+    be scored inside a lazy (or streaming) query without a NumPy round trip.
+
+    Features with a zero coefficient are left out of the expression, so the
+    optimiser can skip reading them entirely.
+
+    Args:
+        model (BaseEstimator): A fitted estimator exposing ``coef_`` and
+            ``intercept_``, e.g. LinearRegression, Ridge, Lasso, ElasticNet,
+            PoissonRegressor, TweedieRegressor or a binary LogisticRegression.
+        features (Optional[Sequence[str]]): The column for each coefficient, in
+            order. Defaults to ``feature_names_in_`` when the model was fitted on
+            a data frame.
+        link (Optional[Link]): The inverse link applied to the linear predictor.
+            Inferred from the estimator if not given; a logit link yields the
+            probability of the positive class.
+        clip (Optional[Tuple[Optional[float], Optional[float]]]): Lower and upper
+            bounds applied to the final prediction.
+        name (str): The output column name.
+
+    Returns:
+        pl.Expr: An expression evaluating to the model's predictions.
+
+    Raises:
+        ValueError: If the model is not a single-output linear model or the
+            features do not match its coefficients.
+    """
+    if not hasattr(model, "coef_") or not hasattr(model, "intercept_"):
+        raise ValueError(f"{type(model).__name__} is not a fitted linear model.")
+    coef = np.atleast_2d(np.asarray(model.coef_, dtype=float))
+    intercept = np.ravel(np.asarray(model.intercept_, dtype=float))
+    if coef.shape[0] != 1 or intercept.size != 1:
+        raise ValueError("Only single-output (or binary) linear models are supported.")
+
+    columns = _resolve_features(model, features, coef.shape[1])
+    linear = reduce(
+        lambda total, term: total + term,
+        [
+            pl.col(column).cast(pl.Float64) * float(c)
+            for column, c in zip(columns, coef[0])
+            if c != 0
+        ],
+        pl.lit(float(intercept[0]), dtype=pl.Float64),
+    )
+
+    expr = _apply_inverse_link(linear, link or infer_link(model))
+    if clip is not None:
+        expr = expr.clip(clip[0], clip[1])
+    return expr.alias(name)
+
+
+def infer_link(model: BaseEstimator) -> Link:
+    """
+    Works out which inverse link turns an estimator's linear predictor into its
+    prediction.
+
+    Classifiers only have a link when they model probabilities, i.e.
+    LogisticRegression and SGDClassifier with log loss. Margin classifiers such
+    as RidgeClassifier, LinearSVC, Perceptron or a hinge-loss SGDClassifier
+    need ``link`` passed explicitly.
+
+    Args:
+        model (BaseEstimator): The fitted estimator.
+
+    Returns:
+        Link: The link name.
+
+    Raises:
+        ValueError: If the estimator uses a link that cannot be compiled.
+    """
+    if is_logistic(model):
+        return "logit"
+    if is_classifier(model):
+        raise ValueError(
+            f"{type(model).__name__} does not model probabilities, pass `link`."
+        )
+    base_loss = getattr(model, "_base_loss", None)
+    if base_loss is None:
+        return "identity"
+    link_name = type(base_loss.link).__name__
+    if link_name not in GLM_LINKS:
+        raise ValueError(f"Unsupported link function: {link_name}")
+    return GLM_LINKS[link_name]  # type: ignore[return-value]
+
+
+def is_logistic(model: BaseEstimator) -> bool:
+    """
+    Checks whether a classifier's decision function is a log-odds.
+
+    Args:
+        model (BaseEstimator): The estimator.
+
+    Returns:
+        bool: True for LogisticRegression and log-loss SGDClassifier.
+    """
+    if isinstance(model, LogisticRegression):
+        return True
+    return isinstance(model, SGDClassifier) and model.loss == "log_loss"
+
+
+def load_compiled_model(
+    version_manager: ModelVersionManager,
+    version: Optional[str] = None,
+    features: Optional[Sequence[str]] = None,
+    link: Optional[Link] = None,
+    clip: Optional[Tuple[Optional[float], Optional[float]]] = None,
+    name: str = "prediction",
+) -> pl.Expr:
+    """
+    Loads a model version and compiles it into a Polars expression.
+
+    Args:
+        version_manager (ModelVersionManager): The manager the model was saved with.
+        version (Optional[str]): The version to load, defaults to the current one.
+        features (Optional[Sequence[str]]): The column for each coefficient.
+        link (Optional[Link]): The inverse link, inferred if not given.
+        clip (Optional[Tuple[Optional[float], Optional[float]]]): Prediction bounds.
+        name (str): The output column name.
+
+    Returns:
+        pl.Expr: An expression evaluating to the model's predictions.
+    """
+    model = version_manager.load_model(version)
+    return compile_linear_model(
+        model, features=features, link=link, clip=clip, name=name
+    )
+
+
+def _resolve_features(
+    model: BaseEstimator, features: Optional[Sequence[str]], n_coef: int
+) -> List[str]:
+    if features is None:
+        names = getattr(model, "feature_names_in_", None)
+        if names is None:
+            raise ValueError(
+                "The model was not fitted with feature names, pass `features`."
+            )
+        features = [str(n) for n in names]
+    if len(features) != n_coef:
+        raise ValueError(
+            f"Got {len(features)} features for a model with {n_coef} coefficients."
+        )
+    return list(features)
+
+
+def _apply_inverse_link(linear: pl.Expr, link: Link) -> pl.Expr:
+    if link == "identity":
+        return linear
+    if link == "log":
+        return linear.exp()
+    if link == "logit":
+        return 1 / (1 + (-linear).exp())
+    raise ValueError(f"Unsupported link function: {link}")
@@ -0,0 +1,608 @@
+import json
+import math
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import polars as pl
+
+from utilities.version import ModelVersionManager
+
+SKETCH_FILENAME = "drift_sketch.json"
+DEFAULT_RELATIVE_ACCURACY = 0.01
+DEFAULT_MAX_CATEGORIES = 100
+PSI_EPSILON = 1e-4
+
+
+@dataclass
+class NumericSketch:
+    """
+    Mergeable log-bucketed quantile sketch for a numeric column.
+
+    Values are assigned to buckets whose boundaries grow geometrically, so any
+    quantile read back from the sketch is within ``relative_accuracy`` of the
+    true value. Sketches built with the same accuracy are merged by summing
+    their bucket counts.
+
+    Date, datetime and time columns are instead counted in fixed-width ``bins``
+    of ``bin_width`` (one day, or one minute for times of day), since relative
+    accuracy on an epoch offset is far too coarse to see them drift.
+
+    NaN and infinite values are counted in ``nonfinite_count`` and excluded
+    from ``count``, the bounds and the buckets.
+    """
+
+    relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY
+    count: int = 0
+    null_count: int = 0
+    zero_count: int = 0
+    min: Optional[float] = None
+    max: Optional[float] = None
+    positive: Dict[int, int] = field(default_factory=dict)
+    negative: Dict[int, int] = field(default_factory=dict)
+    nonfinite_count: int = 0
+    bin_width: Optional[float] = None
+    bins: Dict[int, int] = field(default_factory=dict)
+
+    @property
+    def gamma(self) -> float:
+        return (1 + self.relative_accuracy) / (1 - self.relative_accuracy)
+
+    @property
+    def null_rate(self) -> float:
+        total = self.count + self.null_count + self.nonfinite_count
+        return self.null_count / total if total else 0.0
+
+    @property
+    def nonfinite_rate(self) -> float:
+        total = self.count + self.null_count + self.nonfinite_count
+        return self.nonfinite_count / total if total else 0.0
+
+    def merge(self, other: "NumericSketch") -> "NumericSketch":
+        """
+        Combines two sketches into a new sketch covering both inputs.
+
+        Args:
+            other (NumericSketch): The sketch to merge with.
+
+        Returns:
+            NumericSketch: The merged sketch.
+
+        Raises:
+            ValueError: If the sketches were built with different accuracies or
+                bin widths.
+        """
+        if self.relative_accuracy != other.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different accuracies.")
+        if self.bin_width != other.bin_width:
+            raise ValueError("Cannot merge sketches with different bin widths.")
+        mins = [v for v in (self.min, other.min) if v is not None]
+        maxs = [v for v in (self.max, other.max) if v is not None]
+        return NumericSketch(
+            relative_accuracy=self.relative_accuracy,
+            count=self.count + other.count,
+            null_count=self.null_count + other.null_count,
+            zero_count=self.zero_count + other.zero_count,
+            min=min(mins) if mins else None,
+            max=max(maxs) if maxs else None,
+            positive=_add_counts(self.positive, other.positive),
+            negative=_add_counts(self.negative, other.negative),
+            nonfinite_count=self.nonfinite_count + other.nonfinite_count,
+            bin_width=self.bin_width,
+            bins=_add_counts(self.bins, other.bins),
+        )
+
+    def buckets(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the representative value and count of every bucket, in
+        ascending value order.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: The bucket values and their counts.
+        """
+        if self.bin_width is not None:
+            keys = sorted(self.bins)
+            return (
+                np.array([(k + 0.5) * self.bin_width for k in keys], dtype=float),
+                np.array([self.bins[k] for k in keys], dtype=float),
+            )
+        gamma = self.gamma
+        neg_keys = sorted(self.negative, reverse=True)
+        pos_keys = sorted(self.positive)
+        values = (
+            [-2 * gamma**k / (gamma + 1) for k in neg_keys]
+            + ([0.0] if self.zero_count else [])
+            + [2 * gamma**k / (gamma + 1) for k in pos_keys]
+        )
+        counts = (
+            [self.negative[k] for k in neg_keys]
+            + ([self.zero_count] if self.zero_count else [])
+            + [self.positive[k] for k in pos_keys]
+        )
+        return np.array(values, dtype=float), np.array(counts, dtype=float)
+
+    def cdf(self, points: np.ndarray) -> np.ndarray:
+        """
+        Evaluates the empirical cumulative distribution at the given points.
+
+        Args:
+            points (np.ndarray): The values to evaluate the CDF at.
+
+        Returns:
+            np.ndarray: The fraction of values less than or equal to each point.
+        """
+        values, counts = self.buckets()
+        if not self.count:
+            return np.zeros(len(points))
+        cumulative = np.concatenate([[0.0], np.cumsum(counts)]) / self.count
+        return cumulative[np.searchsorted(values, points, side="right")]
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimates a quantile of the column.
+
+        Args:
+            q (float): The quantile to estimate, between 0 and 1.
+
+        Returns:
+            Optional[float]: The estimated value, or None if the sketch is empty.
+        """
+        if not self.count:
+            return None
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+        values, counts = self.buckets()
+        rank = q * (self.count - 1)
+        index = int(np.searchsorted(np.cumsum(counts), rank, side="right"))
+        value = float(values[min(index, len(values) - 1)])
+        return float(np.clip(value, self.min, self.max))
+
+    def to_dict(self) -> Dict:
+        return {
+            "kind": "numeric",
+            "relative_accuracy": self.relative_accuracy,
+            "count": self.count,
+            "null_count": self.null_count,
+            "zero_count": self.zero_count,
+            "min": self.min,
+            "max": self.max,
+            "positive": {str(k): v for k, v in self.positive.items()},
+            "negative": {str(k): v for k, v in self.negative.items()},
+            "nonfinite_count": self.nonfinite_count,
+            "bin_width": self.bin_width,
+            "bins": {str(k): v for k, v in self.bins.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "NumericSketch":
+        return cls(
+            relative_accuracy=data["relative_accuracy"],
+            count=data["count"],
+            null_count=data["null_count"],
+            zero_count=data["zero_count"],
+            min=data["min"],
+            max=data["max"],
+            positive={int(k): v for k, v in data["positive"].items()},
+            negative={int(k): v for k, v in data["negative"].items()},
+            nonfinite_count=data.get("nonfinite_count", 0),
+            bin_width=data.get("bin_width"),
+            bins={int(k): v for k, v in data.get("bins", {}).items()},
+        )
+
+
+@dataclass
+class CategoricalSketch:
+    """
+    Mergeable frequency sketch for a categorical column.
+
+    Only the ``max_categories`` most frequent values are tracked individually;
+    everything else is accumulated in ``other_count``.
+    """
+
+    max_categories: int = DEFAULT_MAX_CATEGORIES
+    count: int = 0
+    null_count: int = 0
+    other_count: int = 0
+    frequencies: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def null_rate(self) -> float:
+        total = self.count + self.null_count
+        return self.null_count / total if total else 0.0
+
+    def merge(self, other: "CategoricalSketch") -> "CategoricalSketch":
+        """
+        Combines two sketches, keeping the most frequent categories of the union.
+
+        Args:
+            other (CategoricalSketch): The sketch to merge with.
+
+        Returns:
+            CategoricalSketch: The merged sketch.
+        """
+        combined = _add_counts(self.frequencies, other.frequencies)
+        kept = dict(
+            sorted(combined.items(), key=lambda kv: kv[1], reverse=True)[
+                : self.max_categories
+            ]
+        )
+        dropped = sum(combined.values()) - sum(kept.values())
+        return CategoricalSketch(
+            max_categories=self.max_categories,
+            count=self.count + other.count,
+            null_count=self.null_count + other.null_count,
+            other_count=self.other_count + other.other_count + dropped,
+            frequencies=kept,
+        )
+
+    def to_dict(self) -> Dict:
+        return {
+            "kind": "categorical",
+            "max_categories": self.max_categories,
+            "count": self.count,
+            "null_count": self.null_count,
+            "other_count": self.other_count,
+            "frequencies": self.frequencies,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "CategoricalSketch":
+        return cls(
+            max_categories=data["max_categories"],
+            count=data["count"],
+            null_count=data["null_count"],
+            other_count=data["other_count"],
+            frequencies=dict(data["frequencies"]),
+        )
+
+
+ColumnSketch = Union[NumericSketch, CategoricalSketch]
+
+
+@dataclass
+class DatasetSketch:
+    """
+    Per-column sketches summarising a dataset, small enough to store with a
+    model version and compare against new data without rereading it.
+    """
+
+    row_count: int = 0
+    columns: Dict[str, ColumnSketch] = field(default_factory=dict)
+
+    @classmethod
+    def from_lazyframe(
+        cls,
+        lf: pl.LazyFrame,
+        columns: Optional[List[str]] = None,
+        relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY,
+        max_categories: int = DEFAULT_MAX_CATEGORIES,
+    ) -> "DatasetSketch":
+        """
+        Builds sketches for every column in a single streaming pass.
+
+        Numeric and temporal columns get a quantile sketch, string, boolean and
+        categorical columns get a frequency sketch, and nested columns are skipped.
+        Temporal columns are sketched on their physical value (e.g. days since
+        the epoch for dates).
+
+        Args:
+            lf (pl.LazyFrame): The data to summarise.
+            columns (Optional[List[str]]): The columns to sketch, defaults to all.
+            relative_accuracy (float): The quantile accuracy of numeric sketches.
+            max_categories (int): The number of categories tracked per column.
+
+        Returns:
+            DatasetSketch: The sketch of the data.
+        """
+        schema = lf.collect_schema()
+        names = columns if columns is not None else schema.names()
+        log_gamma = math.log((1 + relative_accuracy) / (1 - relative_accuracy))
+
+        exprs: List[pl.Expr] = [pl.len().alias("__rows")]
+        kinds: Dict[str, str] = {}
+        bin_widths: Dict[str, Optional[float]] = {}
+        for name in names:
+            dtype = schema[name]
+            if dtype.is_numeric() or dtype.is_temporal():
+                kinds[name] = "numeric"
+                bin_widths[name] = _temporal_bin_width(dtype)
+                exprs.extend(_numeric_exprs(name, dtype, log_gamma, bin_widths[name]))
+            elif dtype in (pl.Utf8, pl.Boolean, pl.Categorical, pl.Enum):
+                kinds[name] = "categorical"
+                exprs.extend(_categorical_exprs(name, max_categories))
+
+        row = lf.select(exprs).collect(engine="streaming").row(0, named=True)
+
+        sketches: Dict[str, ColumnSketch] = {}
+        for name, kind in kinds.items():
+            if kind == "numeric":
+                sketches[name] = NumericSketch(
+                    relative_accuracy=relative_accuracy,
+                    count=row[f"{name}__count"],
+                    null_count=row[f"{name}__nulls"],
+                    zero_count=row[f"{name}__zero"],
+                    min=row[f"{name}__min"],
+                    max=row[f"{name}__max"],
+                    positive=_struct_counts(row[f"{name}__pos"]),
+                    negative=_struct_counts(row[f"{name}__neg"]),
+                    nonfinite_count=row[f"{name}__nonfinite"],
+                    bin_width=bin_widths[name],
+                    bins=_struct_counts(row[f"{name}__bins"]),
+                )
+            else:
+                frequencies = {
+                    str(k): v for k, v in _struct_counts(row[f"{name}__freq"]).items()
+                }
+                count = row[f"{name}__count"]
+                sketches[name] = CategoricalSketch(
+                    max_categories=max_categories,
+                    count=count,
+                    null_count=row[f"{name}__nulls"],
+                    other_count=count - sum(frequencies.values()),
+                    frequencies=frequencies,
+                )
+        return cls(row_count=row["__rows"], columns=sketches)
+
+    def merge(self, other: "DatasetSketch") -> "DatasetSketch":
+        """
+        Combines two dataset sketches, e.g. from separate partitions.
+
+        Args:
+            other (DatasetSketch): The sketch to merge with.
+
+        Returns:
+            DatasetSketch: The merged sketch.
+
+        Raises:
+            ValueError: If a shared column has a different sketch kind on each side.
+        """
+        merged: Dict[str, ColumnSketch] = dict(self.columns)
+        for name, sketch in other.columns.items():
+            if name not in merged:
+                merged[name] = sketch
+            elif type(merged[name]) is not type(sketch):
+                raise ValueError(f"Column '{name}' has mismatched sketch kinds.")
+            else:
+                merged[name] = merged[name].merge(sketch)  # type: ignore[arg-type]
+        return DatasetSketch(row_count=self.row_count + other.row_count, columns=merged)
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "row_count": self.row_count,
+                "columns": {k: v.to_dict() for k, v in self.columns.items()},
+            }
+        )
+
+    @classmethod
+    def from_json(cls, raw: Union[str, bytes]) -> "DatasetSketch":
+        data = json.loads(raw)
+        columns: Dict[str, ColumnSketch] = {}
+        for name, sketch in data["columns"].items():
+            if sketch["kind"] == "numeric":
+                columns[name] = NumericSketch.from_dict(sketch)
+            else:
+                columns[name] = CategoricalSketch.from_dict(sketch)
+        return cls(row_count=data["row_count"], columns=columns)
+
+    def save(self, version_manager: ModelVersionManager, version: str) -> str:
+        """
+        Stores the sketch alongside a model version.
+
+        Args:
+            version_manager (ModelVersionManager): The manager for the model.
+            version (str): The model version the sketch describes.
+
+        Returns:
+            str: The S3 key the sketch was written to.
+        """
+        return version_manager.save_artifact(
+            self.to_json().encode("utf-8"), version, SKETCH_FILENAME
+        )
+
+    @classmethod
+    def load(
+        cls, version_manager: ModelVersionManager, version: str
+    ) -> "DatasetSketch":
+        """
+        Loads the sketch stored alongside a model version.
+
+        Args:
+            version_manager (ModelVersionManager): The manager for the model.
+            version (str): The model version to load the sketch for.
+
+        Returns:
+            DatasetSketch: The stored sketch.
+        """
+        return cls.from_json(version_manager.load_artifact(version, SKETCH_FILENAME))
+
+
+def compare_sketches(
+    reference: DatasetSketch,
+    current: DatasetSketch,
+    n_bins: int = 10,
+    psi_threshold: float = 0.2,
+) -> pl.DataFrame:
+    """
+    Scores drift between a reference sketch (e.g. the training data) and a
+    sketch of new data, column by column.
+
+    Numeric columns are scored with the population stability index over the
+    reference deciles and the Kolmogorov-Smirnov statistic; categorical columns
+    with the population stability index over the tracked categories.
+
+    Args:
+        reference (DatasetSketch): The sketch the model was trained on.
+        current (DatasetSketch): The sketch of the data being scored.
+        n_bins (int): The number of reference quantile bins used for numeric PSI.
+        psi_threshold (float): The PSI above which a column is flagged as drifted.
+
+    Returns:
+        pl.DataFrame: One row per shared column with its drift scores.
+
+    Raises:
+        ValueError: If a shared column has a different sketch kind on each side.
+    """
+    rows = []
+    for name, ref in reference.columns.items():
+        cur = current.columns.get(name)
+        if cur is None:
+            continue
+        if isinstance(ref, NumericSketch) and isinstance(cur, NumericSketch):
+            psi, ks = _numeric_scores(ref, cur, n_bins)
+            kind = "numeric"
+        elif isinstance(ref, CategoricalSketch) and isinstance(cur, CategoricalSketch):
+            psi, ks = _categorical_psi(ref, cur), None
+            kind = "categorical"
+        else:
+            raise ValueError(f"Column '{name}' has mismatched sketch kinds.")
+        rows.append(
+            {
+                "column": name,
+                "kind": kind,
+                "psi": psi,
+                "ks": ks,
+                "reference_null_rate": ref.null_rate,
+                "current_null_rate": cur.null_rate,
+                "reference_nonfinite_rate": _nonfinite_rate(ref),
+                "current_nonfinite_rate": _nonfinite_rate(cur),
+                "drifted": psi > psi_threshold,
+            }
+        )
+    return pl.DataFrame(
+        rows,
+        schema={
+            "column": pl.Utf8,
+            "kind": pl.Utf8,
+            "psi": pl.Float64,
+            "ks": pl.Float64,
+            "reference_null_rate": pl.Float64,
+            "current_null_rate": pl.Float64,
+            "reference_nonfinite_rate": pl.Float64,
+            "current_nonfinite_rate": pl.Float64,
+            "drifted": pl.Boolean,
+        },
+    )
+
+
+def _numeric_exprs(
+    name: str,
+    dtype: pl.DataType,
+    log_gamma: float,
+    bin_width: Optional[float] = None,
+) -> List[pl.Expr]:
+    # Decimals must keep their scale, only temporal values are sketched on
+    # their physical representation.
+    x = pl.col(name)
+    x = (x.to_physical() if dtype.is_temporal() else x).cast(pl.Float64)
+    finite = x.filter(x.is_finite())
+    if bin_width is None:
+        positive, negative = finite.filter(finite > 0), -finite.filter(finite < 0)
+        binned = finite.filter(pl.lit(False))
+    else:
+        positive = negative = finite.filter(pl.lit(False))
+        binned = finite
+    return [
+        finite.count().alias(f"{name}__count"),
+        x.null_count().alias(f"{name}__nulls"),
+        (~x.is_finite()).sum().alias(f"{name}__nonfinite"),
+        (finite == 0).sum().alias(f"{name}__zero"),
+        finite.min().alias(f"{name}__min"),
+        finite.max().alias(f"{name}__max"),
+        _bucket_counts(positive, log_gamma).alias(f"{name}__pos"),
+        _bucket_counts(negative, log_gamma).alias(f"{name}__neg"),
+        _bin_counts(binned, bin_width or 1.0).alias(f"{name}__bins"),
+    ]
+
+
+def _temporal_bin_width(dtype: pl.DataType) -> Optional[float]:
+    """The width of one bin, in the column's physical unit, for columns sketched
+    with fixed-width bins; None for log-bucketed columns."""
+    per_second = {"ms": 1e3, "us": 1e6, "ns": 1e9}
+    if dtype == pl.Date:
+        return 1.0
+    if isinstance(dtype, pl.Datetime):
+        return 86_400 * per_second[dtype.time_unit or "us"]
+    if dtype == pl.Time:
+        return 60 * per_second["ns"]
+    return None
+
+
+def _bucket_counts(values: pl.Expr, log_gamma: float) -> pl.Expr:
+    keys = (values.log() / log_gamma).ceil().cast(pl.Int64).alias("key")
+    return keys.value_counts().implode()
+
+
+def _bin_counts(values: pl.Expr, bin_width: float) -> pl.Expr:
+    keys = (values / bin_width).floor().cast(pl.Int64).alias("key")
+    return keys.value_counts().implode()
+
+
+def _nonfinite_rate(sketch: ColumnSketch) -> Optional[float]:
+    return sketch.nonfinite_rate if isinstance(sketch, NumericSketch) else None
+
+
+def _categorical_exprs(name: str, max_categories: int) -> List[pl.Expr]:
+    x = pl.col(name).cast(pl.Utf8)
+    return [
+        x.count().alias(f"{name}__count"),
+        x.null_count().alias(f"{name}__nulls"),
+        x.drop_nulls()
+        .alias("key")
+        .value_counts(sort=True)
+        .head(max_categories)
+        .implode()
+        .alias(f"{name}__freq"),
+    ]
+
+
+def _struct_counts(entries: List[Dict]) -> Dict:
+    return {entry["key"]: entry["count"] for entry in entries}
+
+
+def _add_counts(left: Dict, right: Dict) -> Dict:
+    combined = dict(left)
+    for key, value in right.items():
+        combined[key] = combined.get(key, 0) + value
+    return combined
+
+
+def _psi(expected: np.ndarray, actual: np.ndarray) -> float:
+    expected = np.maximum(expected, PSI_EPSILON)
+    actual = np.maximum(actual, PSI_EPSILON)
+    return float(np.sum((actual - expected) * np.log(actual / expected)))
+
+
+def _numeric_scores(
+    ref: NumericSketch, cur: NumericSketch, n_bins: int
+) -> Tuple[float, float]:
+    if ref.relative_accuracy != cur.relative_accuracy:
+        raise ValueError("Cannot compare sketches with different accuracies.")
+    if ref.bin_width != cur.bin_width:
+        raise ValueError("Cannot compare sketches with different bin widths.")
+    if not ref.count or not cur.count:
+        return 0.0, 0.0
+    edges = np.unique(
+        [ref.quantile(i / n_bins) for i in range(1, n_bins)]  # type: ignore[misc]
+    )
+    ref_cdf = np.concatenate([[0.0], ref.cdf(edges), [1.0]])
+    cur_cdf = np.concatenate([[0.0], cur.cdf(edges), [1.0]])
+    psi = _psi(np.diff(ref_cdf), np.diff(cur_cdf))
+
+    points = np.union1d(ref.buckets()[0], cur.buckets()[0])
+    ks = float(np.max(np.abs(ref.cdf(points) - cur.cdf(points))))
+    return psi, ks
+
+
+def _categorical_psi(ref: CategoricalSketch, cur: CategoricalSketch) -> float:
+    if not ref.count or not cur.count:
+        return 0.0
+    categories = sorted(set(ref.frequencies) | set(cur.frequencies))
+    ref_counts = [ref.frequencies.get(c, 0) for c in categories] + [ref.other_count]
+    cur_counts = [cur.frequencies.get(c, 0) for c in categories] + [cur.other_count]
+    return _psi(
+        np.array(ref_counts, dtype=float) / ref.count,
+        np.array(cur_counts, dtype=float) / cur.count,
+    )
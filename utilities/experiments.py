@@ -0,0 +1,354 @@
+import glob
+import hashlib
+import io
+import json
+import os
+import uuid
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence, Union
+from urllib.parse import quote
+
+import boto3
+import polars as pl
+
+from utilities.instrumentation import REGISTRY, instrument_client
+
+REGION = os.environ.get("AWS_REGION", "eu-west-2")
+PARTITIONS = {"model_name": pl.Utf8(), "date": pl.Date()}
+
+_NAMED_VALUES = pl.List(pl.Struct({"name": pl.Utf8(), "value": pl.Float64()}))
+RUN_SCHEMA = pl.Schema(
+    {
+        "run_id": pl.Utf8(),
+        "recorded_at": pl.Datetime("us", "UTC"),
+        "version": pl.Utf8(),
+        "segment": pl.Utf8(),
+        "params": pl.Utf8(),
+        "dataset_fingerprint": pl.Utf8(),
+        "n_train_rows": pl.Int64(),
+        "n_test_rows": pl.Int64(),
+        "metrics": _NAMED_VALUES,
+        "timings": _NAMED_VALUES,
+        "artifact_key": pl.Utf8(),
+    }
+)
+
+
+@dataclass
+class RunRecord:
+    """
+    One training run, as stored in the experiment log.
+
+    Attributes:
+        model_name (str): The model the run belongs to, used as a partition.
+        version (Optional[str]): The version the run was published as.
+        metrics (Dict[str, float]): Evaluation metrics, e.g. ``{"r2": 0.93}``.
+        params (Dict[str, Any]): JSON-serialisable training parameters.
+        timings (Dict[str, float]): Phase durations in seconds.
+        n_train_rows (Optional[int]): The number of training rows.
+        n_test_rows (Optional[int]): The number of evaluation rows.
+        dataset_fingerprint (Optional[str]): See ``dataset_fingerprint``.
+        segment (Optional[str]): The segment path, for per-segment models.
+        artifact_key (Optional[str]): The S3 key of the saved model.
+        run_id (str): A unique id, generated if not given.
+        recorded_at (datetime): When the run finished, defaults to now (UTC).
+    """
+
+    model_name: str
+    version: Optional[str] = None
+    metrics: Dict[str, float] = field(default_factory=dict)
+    params: Dict[str, Any] = field(default_factory=dict)
+    timings: Dict[str, float] = field(default_factory=dict)
+    n_train_rows: Optional[int] = None
+    n_test_rows: Optional[int] = None
+    dataset_fingerprint: Optional[str] = None
+    segment: Optional[str] = None
+    artifact_key: Optional[str] = None
+    run_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    recorded_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+    def to_frame(self) -> pl.DataFrame:
+        return pl.DataFrame(
+            [
+                {
+                    "run_id": self.run_id,
+                    "recorded_at": self.recorded_at,
+                    "version": self.version,
+                    "segment": self.segment,
+                    "params": json.dumps(self.params, sort_keys=True, default=str),
+                    "dataset_fingerprint": self.dataset_fingerprint,
+                    "n_train_rows": self.n_train_rows,
+                    "n_test_rows": self.n_test_rows,
+                    "metrics": _named_values(self.metrics),
+                    "timings": _named_values(self.timings),
+                    "artifact_key": self.artifact_key,
+                }
+            ],
+            schema=RUN_SCHEMA,
+        )
+
+
+class ExperimentStore:
+    """
+    Append-only log of training runs, stored as Parquet files partitioned by
+    model name and date under a local directory or an ``s3://`` prefix.
+
+    Each run is written as its own file, so concurrent writers never contend.
+    ``compact`` later merges a partition's run files into one, so queries read
+    a file per model and day rather than one per run. Queries scan the log with
+    Hive partitioning, so filters on ``model_name`` and ``date`` skip whole
+    directories and other filters are pushed down into the Parquet reader.
+    """
+
+    def __init__(
+        self, root: str, storage_options: Optional[Dict[str, Any]] = None
+    ) -> None:
+        self.root = root.rstrip("/")
+        self.storage_options = storage_options
+        self._s3_client = None
+
+    @property
+    def is_s3(self) -> bool:
+        return self.root.startswith("s3://")
+
+    def run_path(self, record: RunRecord) -> str:
+        """
+        Builds the path a run is written to.
+
+        Args:
+            record (RunRecord): The run.
+
+        Returns:
+            str: ``{root}/model_name={name}/date={YYYY-MM-DD}/{run_id}.parquet``.
+        """
+        day = record.recorded_at.astimezone(timezone.utc).date().isoformat()
+        return (
+            f"{self.root}/model_name={quote(record.model_name, safe='')}"
+            f"/date={day}/{record.run_id}.parquet"
+        )
+
+    def record(self, record: RunRecord) -> str:
+        """
+        Appends a run to the log.
+
+        Args:
+            record (RunRecord): The run.
+
+        Returns:
+            str: The path the run was written to.
+        """
+        path = self.run_path(record)
+        with REGISTRY.timer("experiments.write"):
+            self._write(record.to_frame(), path)
+        print(f"Recorded run {record.run_id} to {path}")
+        return path
+
+    def compact(self, model_name: Optional[str] = None) -> int:
+        """
+        Merges the run files of each ``model_name=/date=`` partition into a
+        single file. Runs are never rewritten across partitions, so the log
+        stays append-only at the partition level.
+
+        The merged file is written before the run files are removed, so a run
+        is never missing from the log, although a query running at the same
+        time may briefly see some runs twice. Only one process should compact
+        a model's partitions at a time.
+
+        Args:
+            model_name (Optional[str]): Only compact this model's partitions.
+
+        Returns:
+            int: The number of files removed.
+        """
+        removed = 0
+        with REGISTRY.timer("experiments.compact"):
+            for partition, files in self._partition_files(model_name).items():
+                if len(files) < 2:
+                    continue
+                runs = pl.scan_parquet(
+                    files,
+                    schema=RUN_SCHEMA,
+                    missing_columns="insert",
+                    hive_partitioning=False,
+                    storage_options=self.storage_options,
+                ).collect()
+                self._write(runs, f"{partition}/compacted-{uuid.uuid4().hex}.parquet")
+                self._delete(files)
+                removed += len(files) - 1
+        print(f"Compacted {removed} run files under {self.root}")
+        return removed
+
+    def scan(
+        self,
+        model_name: Optional[str] = None,
+        since: Optional[date] = None,
+        until: Optional[date] = None,
+    ) -> pl.LazyFrame:
+        """
+        Lazily scans the log, optionally restricted to a model and date range.
+
+        Args:
+            model_name (Optional[str]): Only runs of this model.
+            since (Optional[date]): Only runs on or after this date.
+            until (Optional[date]): Only runs on or before this date.
+
+        Returns:
+            pl.LazyFrame: The runs, with ``model_name`` and ``date`` columns.
+        """
+        source = f"{self.root}/**/*.parquet"
+        if not self.is_s3 and not glob.glob(source, recursive=True):
+            lf = pl.LazyFrame(schema={**RUN_SCHEMA, **PARTITIONS})
+        else:
+            lf = pl.scan_parquet(
+                source,
+                schema=RUN_SCHEMA,
+                missing_columns="insert",
+                hive_partitioning=True,
+                hive_schema=PARTITIONS,
+                storage_options=self.storage_options,
+            )
+        if model_name is not None:
+            lf = lf.filter(pl.col("model_name") == model_name)
+        if since is not None:
+            lf = lf.filter(pl.col("date") >= since)
+        if until is not None:
+            lf = lf.filter(pl.col("date") <= until)
+        return lf
+
+    def best_runs(
+        self,
+        metric: str = "r2",
+        by: Union[str, Sequence[str]] = ("model_name", "segment"),
+        days: Optional[int] = 90,
+        model_name: Optional[str] = None,
+        higher_is_better: bool = True,
+    ) -> pl.DataFrame:
+        """
+        Finds the best run per group by a metric, e.g. the best R² per segment
+        over the last 90 days.
+
+        Args:
+            metric (str): The metric to rank runs by.
+            by (Union[str, Sequence[str]]): The column(s) to group runs by.
+            days (Optional[int]): Only consider runs from the last ``days`` days.
+            model_name (Optional[str]): Only consider runs of this model.
+            higher_is_better (bool): False for error metrics such as RMSE.
+
+        Returns:
+            pl.DataFrame: The best run of each group, with the metric as a column.
+        """
+        keys = [by] if isinstance(by, str) else list(by)
+        since = date.today() - timedelta(days=days) if days is not None else None
+        with REGISTRY.timer("experiments.query"):
+            return (
+                self.scan(model_name=model_name, since=since)
+                .with_columns(metric_value(metric).alias(metric))
+                .drop_nulls(metric)
+                .sort(metric, descending=higher_is_better)
+                .group_by(keys, maintain_order=True)
+                .first()
+                .sort(keys, nulls_last=True)
+                .collect()
+            )
+
+    def _partition_files(self, model_name: Optional[str]) -> Dict[str, List[str]]:
+        """Lists the Parquet files of each partition, keyed by partition path."""
+        prefix = self.root + "/"
+        if model_name is not None:
+            prefix += f"model_name={quote(model_name, safe='')}/"
+        if self.is_s3:
+            bucket, key_prefix = prefix[len("s3://") :].split("/", 1)
+            paginator = self.s3_client.get_paginator("list_objects_v2")
+            paths = [
+                f"s3://{bucket}/{obj['Key']}"
+                for page in paginator.paginate(Bucket=bucket, Prefix=key_prefix)
+                for obj in page.get("Contents", [])
+            ]
+        else:
+            paths = glob.glob(f"{prefix}**/*.parquet", recursive=True)
+        partitions: Dict[str, List[str]] = {}
+        for path in sorted(paths):
+            partition, filename = path.rsplit("/", 1)
+            if filename.endswith(".parquet") and "/date=" in partition:
+                partitions.setdefault(partition, []).append(path)
+        return partitions
+
+    def _write(self, frame: pl.DataFrame, path: str) -> None:
+        if self.is_s3:
+            buffer = io.BytesIO()
+            frame.write_parquet(buffer)
+            bucket, key = path[len("s3://") :].split("/", 1)
+            self.s3_client.put_object(Bucket=bucket, Key=key, Body=buffer.getvalue())
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            frame.write_parquet(path)
+
+    def _delete(self, paths: List[str]) -> None:
+        if not self.is_s3:
+            for path in paths:
+                os.remove(path)
+            return
+        bucket = paths[0][len("s3://") :].split("/", 1)[0]
+        keys = [path[len(f"s3://{bucket}/") :] for path in paths]
+        for start in range(0, len(keys), 1000):
+            self.s3_client.delete_objects(
+                Bucket=bucket,
+                Delete={"Objects": [{"Key": k} for k in keys[start : start + 1000]]},
+            )
+
+    @property
+    def s3_client(self):
+        if self._s3_client is None:
+            self._s3_client = instrument_client(boto3.client("s3", region_name=REGION))
+        return self._s3_client
+
+
+def metric_value(name: str, column: str = "metrics") -> pl.Expr:
+    """
+    Extracts one named value from a ``metrics`` or ``timings`` column.
+
+    Args:
+        name (str): The metric or timing name.
+        column (str): The column to read it from.
+
+    Returns:
+        pl.Expr: The value, null for runs that did not record it.
+    """
+    return (
+        pl.col(column)
+        .list.eval(
+            pl.element()
+            .filter(pl.element().struct.field("name") == name)
+            .struct.field("value")
+        )
+        .list.first()
+    )
+
+
+def dataset_fingerprint(lf: pl.LazyFrame) -> str:
+    """
+    Summarises a dataset's schema and contents as a short hash, so runs
+    trained on the same data can be recognised. Row order does not matter.
+
+    The row hashes come from Polars, so fingerprints are only comparable
+    between runs using the same Polars version.
+
+    Args:
+        lf (pl.LazyFrame): The dataset.
+
+    Returns:
+        str: A 16 character hex fingerprint.
+    """
+    rows, content = (
+        lf.select(pl.len(), pl.struct(pl.all()).hash(0).sum())
+        .collect(engine="streaming")
+        .row(0)
+    )
+    schema = ",".join(f"{k}:{v}" for k, v in lf.collect_schema().items())
+    digest = hashlib.sha256(f"{schema}|{rows}|{content}".encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def _named_values(values: Dict[str, float]) -> List[Dict[str, Any]]:
+    return [{"name": k, "value": float(v)} for k, v in values.items()]
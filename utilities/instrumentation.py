@@ -0,0 +1,323 @@
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+EXPORT_ENV_VAR = "UTILITIES_METRICS_EXPORT"
+LATENCY_SAMPLES = 1024
+THROTTLE_CODES = {
+    "Throttling",
+    "ThrottlingException",
+    "ThrottledException",
+    "RequestThrottledException",
+    "TooManyRequestsException",
+    "ProvisionedThroughputExceededException",
+    "RequestLimitExceeded",
+    "SlowDown",
+}
+_START_KEY = "instrumentation_start"
+_SENT_KEY = "instrumentation_bytes_sent"
+_THROTTLE_KEY = "instrumentation_throttles"
+
+
+@dataclass
+class OperationStats:
+    """
+    Running totals for one AWS operation or timed phase.
+
+    Attributes:
+        count (int): The number of calls recorded.
+        errors (int): The number of calls that failed.
+        retries (int): The number of retry attempts made by botocore.
+        throttles (int): The number of throttling responses received.
+        total_seconds (float): The summed latency.
+        max_seconds (float): The slowest call.
+        bytes_sent (int): The request payload bytes.
+        bytes_received (int): The response payload bytes.
+        last_error (Optional[str]): The most recent error code or message.
+        latencies (Deque[float]): The most recent latencies, for percentiles.
+    """
+
+    count: int = 0
+    errors: int = 0
+    retries: int = 0
+    throttles: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    last_error: Optional[str] = None
+    latencies: Deque[float] = field(
+        default_factory=lambda: deque(maxlen=LATENCY_SAMPLES)
+    )
+
+    def to_dict(self) -> Dict[str, Any]:
+        ordered = sorted(self.latencies)
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "retries": self.retries,
+            "throttles": self.throttles,
+            "total_seconds": self.total_seconds,
+            "mean_seconds": self.total_seconds / self.count if self.count else 0.0,
+            "p50_seconds": _percentile(ordered, 0.5),
+            "p99_seconds": _percentile(ordered, 0.99),
+            "max_seconds": self.max_seconds,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "last_error": self.last_error,
+        }
+
+
+class MetricsRegistry:
+    """
+    Thread-safe in-process registry of AWS call and processing phase metrics.
+
+    Recording is a dictionary lookup and a few additions under a lock, so it
+    is cheap enough to leave switched on in production jobs.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stats: Dict[str, OperationStats] = {}
+
+    def record(
+        self,
+        name: str,
+        seconds: float,
+        bytes_sent: int = 0,
+        bytes_received: int = 0,
+        retries: int = 0,
+        throttles: int = 0,
+        error: Optional[str] = None,
+    ) -> None:
+        """
+        Records a single call or phase.
+
+        Args:
+            name (str): The operation name, e.g. "s3.PutObject" or "version.pickle".
+            seconds (float): The latency of the call.
+            bytes_sent (int): The request payload bytes.
+            bytes_received (int): The response payload bytes.
+            retries (int): The number of retries made.
+            throttles (int): The number of throttling responses received.
+            error (Optional[str]): The error code or message if the call failed.
+        """
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = OperationStats()
+            stats.count += 1
+            stats.total_seconds += seconds
+            stats.max_seconds = max(stats.max_seconds, seconds)
+            stats.latencies.append(seconds)
+            stats.bytes_sent += bytes_sent
+            stats.bytes_received += bytes_received
+            stats.retries += retries
+            stats.throttles += throttles
+            if error is not None:
+                stats.errors += 1
+                stats.last_error = error
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        """
+        Times a block of code, recording it as failed if it raises.
+
+        Args:
+            name (str): The phase name, e.g. "schema_reader.parse".
+
+        Yields:
+            None: Control to the timed block.
+
+        Raises:
+            Exception: Whatever the timed block raised, after recording it.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            self.record(name, time.perf_counter() - start, error=repr(e))
+            raise
+        self.record(name, time.perf_counter() - start)
+
+    def get(self, name: str) -> Optional[OperationStats]:
+        with self._lock:
+            return self._stats.get(name)
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return sum(s.bytes_sent + s.bytes_received for s in self._stats.values())
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {name: stats.to_dict() for name, stats in self._stats.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), indent=2, sort_keys=True)
+
+    def log(self, log: logging.Logger = logger) -> None:
+        """
+        Emits one structured log line per recorded operation.
+
+        Args:
+            log (logging.Logger): The logger to write to.
+        """
+        for name, stats in sorted(self.snapshot().items()):
+            log.info(json.dumps({"metric": name, **stats}))
+
+    def export(self, path: Optional[str] = None) -> None:
+        """
+        Writes the registry as JSON to a file, or as structured logs if no path
+        is given.
+
+        Args:
+            path (Optional[str]): The file to write to.
+        """
+        if path:
+            with open(path, "w") as f:
+                f.write(self.to_json())
+        else:
+            self.log()
+
+    def export_at_exit(self, path: Optional[str] = None) -> None:
+        """
+        Exports the registry when the interpreter exits.
+
+        Args:
+            path (Optional[str]): The file to write to, structured logs if not given.
+        """
+        atexit.register(self.export, path)
+
+
+REGISTRY = MetricsRegistry()
+
+
+def instrument_client(client: Any, registry: Optional[MetricsRegistry] = None) -> Any:
+    """
+    Hooks a boto3 client so every call records its latency, retries, throttles,
+    payload bytes and errors. Instrumenting the same client twice is a no-op.
+
+    Args:
+        client (Any): The boto3 client.
+        registry (Optional[MetricsRegistry]): Where to record, defaults to REGISTRY.
+
+    Returns:
+        Any: The same client, for chaining.
+    """
+    registry = registry or REGISTRY
+    events = client.meta.events
+    key = f"instrumentation-{id(registry)}"
+
+    def before_call(context: Dict, **kwargs: Any) -> None:
+        context[_START_KEY] = time.perf_counter()
+        context[_SENT_KEY] = 0
+        context[_THROTTLE_KEY] = 0
+
+    def request_created(request: Any, **kwargs: Any) -> None:
+        context = request.context
+        if _SENT_KEY in context:
+            context[_SENT_KEY] += _request_bytes(request)
+
+    def needs_retry(request_dict: Dict, response: Any, **kwargs: Any) -> None:
+        context = request_dict.get("context", {})
+        if response is not None and _SENT_KEY in context:
+            code = response[1].get("Error", {}).get("Code")
+            if code in THROTTLE_CODES:
+                context[_THROTTLE_KEY] += 1
+
+    def after_call(
+        http_response: Any, parsed: Dict, model: Any, context: Dict, **kwargs: Any
+    ) -> None:
+        if _START_KEY not in context:
+            return
+        error = parsed.get("Error", {}).get("Code")
+        throttles = context[_THROTTLE_KEY]
+        if error in THROTTLE_CODES and not throttles:
+            throttles = 1
+        registry.record(
+            _operation_name(model),
+            time.perf_counter() - context[_START_KEY],
+            bytes_sent=context[_SENT_KEY],
+            bytes_received=_response_bytes(http_response, model),
+            retries=parsed.get("ResponseMetadata", {}).get("RetryAttempts", 0),
+            throttles=throttles,
+            error=error,
+        )
+
+    def after_call_error(
+        exception: Exception, model: Any, context: Dict, **kwargs: Any
+    ) -> None:
+        if _START_KEY not in context:
+            return
+        registry.record(
+            _operation_name(model),
+            time.perf_counter() - context[_START_KEY],
+            bytes_sent=context[_SENT_KEY],
+            throttles=context[_THROTTLE_KEY],
+            error=repr(exception),
+        )
+
+    # Registered first on the most specific node so the start time is set even
+    # when another before-call handler (e.g. a Stubber) short-circuits the call.
+    events.register_first(
+        "before-call.*.*", before_call, unique_id=f"{key}-before-call"
+    )
+    events.register(
+        "request-created", request_created, unique_id=f"{key}-request-created"
+    )
+    events.register("needs-retry", needs_retry, unique_id=f"{key}-needs-retry")
+    events.register("after-call", after_call, unique_id=f"{key}-after-call")
+    events.register(
+        "after-call-error", after_call_error, unique_id=f"{key}-after-call-error"
+    )
+    return client
+
+
+def _operation_name(model: Any) -> str:
+    return f"{model.service_model.service_name}.{model.name}"
+
+
+def _request_bytes(request: Any) -> int:
+    length = request.headers.get("X-Amz-Decoded-Content-Length")
+    length = length or request.headers.get("Content-Length")
+    if length is not None:
+        return int(length)
+    if isinstance(request.body, (bytes, str)):
+        return len(request.body)
+    return 0
+
+
+def _response_bytes(http_response: Any, model: Any) -> int:
+    if http_response is None or model.http.get("method") == "HEAD":
+        return 0
+    length = http_response.headers.get("content-length")
+    if length is not None:
+        return int(length)
+    if not model.has_streaming_output and http_response.raw is not None:
+        return len(http_response.content)
+    return 0
+
+
+def _percentile(ordered: list, q: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+if os.environ.get(EXPORT_ENV_VAR):
+    REGISTRY.export_at_exit(
+        None if os.environ[EXPORT_ENV_VAR] == "log" else os.environ[EXPORT_ENV_VAR]
+    )
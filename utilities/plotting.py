@@ -0,0 +1,274 @@
+from dataclasses import dataclass
+from typing import List, Literal, Optional, Tuple, Union
+
+import matplotlib.pyplot as plt
+import numpy as np
+import polars as pl
+from matplotlib.axes import Axes
+from matplotlib.cm import ScalarMappable
+from sklearn.base import BaseEstimator
+
+from utilities.sampling import reservoir_sample, stratified_sample
+
+HEXBIN_OVERSAMPLE = 4
+
+
+@dataclass
+class BinnedXY:
+    """
+    Counts of rows falling in each cell of a regular x/y grid.
+
+    Attributes:
+        counts (np.ndarray): Counts with shape (y bins, x bins).
+        x_edges (np.ndarray): The x bin edges.
+        y_edges (np.ndarray): The y bin edges.
+    """
+
+    counts: np.ndarray
+    x_edges: np.ndarray
+    y_edges: np.ndarray
+
+    @property
+    def x_centres(self) -> np.ndarray:
+        return (self.x_edges[:-1] + self.x_edges[1:]) / 2
+
+    @property
+    def y_centres(self) -> np.ndarray:
+        return (self.y_edges[:-1] + self.y_edges[1:]) / 2
+
+
+def linear_coefficients(model: BaseEstimator) -> Tuple[float, float]:
+    """
+    Reads the slope and intercept of a single-feature linear model.
+
+    Args:
+        model (BaseEstimator): A fitted model exposing ``coef_`` and ``intercept_``.
+
+    Returns:
+        Tuple[float, float]: The slope and intercept.
+    """
+    slope = float(np.ravel(model.coef_)[0])  # type: ignore[attr-defined]
+    intercept = float(np.ravel(model.intercept_)[0])  # type: ignore[attr-defined]
+    return slope, intercept
+
+
+def bin_xy(
+    lf: pl.LazyFrame,
+    x: Union[str, pl.Expr],
+    y: Union[str, pl.Expr],
+    bins: Union[int, Tuple[int, int]] = 100,
+    x_range: Optional[Tuple[float, float]] = None,
+    y_range: Optional[Tuple[float, float]] = None,
+) -> BinnedXY:
+    """
+    Aggregates two columns into a 2D histogram without materialising the rows.
+
+    Rows with a null, NaN or infinite value in either column are dropped. When
+    a range is not given it is taken from the data, which costs one extra
+    aggregation over the frame.
+
+    Args:
+        lf (pl.LazyFrame): The data to bin.
+        x (Union[str, pl.Expr]): The x column name or expression.
+        y (Union[str, pl.Expr]): The y column name or expression.
+        bins (Union[int, Tuple[int, int]]): The number of bins, or (x bins, y bins).
+        x_range (Optional[Tuple[float, float]]): The x extent of the grid.
+        y_range (Optional[Tuple[float, float]]): The y extent of the grid.
+
+    Returns:
+        BinnedXY: The binned counts and bin edges.
+
+    Raises:
+        ValueError: If a given range does not have a positive width.
+    """
+    for label, value_range in (("x_range", x_range), ("y_range", y_range)):
+        if value_range is not None and not value_range[1] > value_range[0]:
+            raise ValueError(f"{label} must have a positive width, got {value_range}.")
+    nx, ny = (bins, bins) if isinstance(bins, int) else bins
+    x_expr = _as_expr(x).cast(pl.Float64).alias("__x")
+    y_expr = _as_expr(y).cast(pl.Float64).alias("__y")
+    points = lf.select(x_expr, y_expr).filter(
+        pl.col("__x").is_finite() & pl.col("__y").is_finite()
+    )
+
+    if x_range is None or y_range is None:
+        bounds = points.select(
+            pl.col("__x").min().alias("x_min"),
+            pl.col("__x").max().alias("x_max"),
+            pl.col("__y").min().alias("y_min"),
+            pl.col("__y").max().alias("y_max"),
+        ).collect(engine="streaming")
+        x_range = x_range or _widen(bounds["x_min"][0], bounds["x_max"][0])
+        y_range = y_range or _widen(bounds["y_min"][0], bounds["y_max"][0])
+
+    binned = (
+        points.select(
+            _bin_index("__x", x_range, nx).alias("bx"),
+            _bin_index("__y", y_range, ny).alias("by"),
+        )
+        .drop_nulls()
+        .group_by("bx", "by")
+        .len()
+        .collect(engine="streaming")
+    )
+
+    counts = np.zeros((ny, nx))
+    counts[binned["by"].to_numpy(), binned["bx"].to_numpy()] = binned["len"].to_numpy()
+    return BinnedXY(
+        counts=counts,
+        x_edges=np.linspace(*x_range, nx + 1),
+        y_edges=np.linspace(*y_range, ny + 1),
+    )
+
+
+def stratified_points(
+    lf: pl.LazyFrame,
+    columns: List[str],
+    n_per_stratum: int,
+    stratify_by: Optional[str] = None,
+    seed: int = 0,
+) -> pl.DataFrame:
+    """
+    Takes a small random sample of rows to overlay on an aggregated plot.
+
+    Args:
+        lf (pl.LazyFrame): The data to sample.
+        columns (List[str]): The columns to keep.
+        n_per_stratum (int): The number of rows to keep per stratum.
+        stratify_by (Optional[str]): The column defining the strata, if any.
+        seed (int): The random seed.
+
+    Returns:
+        pl.DataFrame: The sampled rows.
+    """
+    keep = columns + (
+        [stratify_by] if stratify_by and stratify_by not in columns else []
+    )
+    lf = lf.select(keep)
+    if stratify_by:
+        return stratified_sample(lf, stratify_by, n=n_per_stratum, seed=seed).collect()
+    return reservoir_sample(lf, n_per_stratum, seed=seed).collect()
+
+
+def plot_binned_regression(
+    lf: pl.LazyFrame,
+    x: str,
+    y: str,
+    model: Optional[BaseEstimator] = None,
+    residuals: bool = False,
+    kind: Literal["hist2d", "hexbin"] = "hist2d",
+    bins: int = 100,
+    sample_size: int = 0,
+    stratify_by: Optional[str] = None,
+    seed: int = 0,
+    ax: Optional[Axes] = None,
+) -> Axes:
+    """
+    Plots a regression diagnostic as a density of binned points rather than a
+    scatter of every row, so render time does not grow with the data.
+    If no row has finite x and y values, only the axis labels are drawn.
+
+    Args:
+        lf (pl.LazyFrame): The data to plot.
+        x (str): The feature column.
+        y (str): The target column.
+        model (Optional[BaseEstimator]): A fitted single-feature linear model whose
+            line is overlaid, and which is required when plotting residuals.
+        residuals (bool): Plot ``y - prediction`` instead of ``y``.
+        kind (Literal["hist2d", "hexbin"]): The binning shape to draw.
+        bins (int): The number of bins along the x axis (and y for hist2d).
+        sample_size (int): The number of raw points to overlay per stratum.
+        stratify_by (Optional[str]): The column used to stratify the point sample.
+        seed (int): The random seed of the point sample.
+        ax (Optional[Axes]): The axes to draw on, a new figure is made if not given.
+
+    Returns:
+        Axes: The axes drawn on.
+
+    Raises:
+        ValueError: If residuals are requested without a model.
+    """
+    if residuals and model is None:
+        raise ValueError("A model is required to plot residuals.")
+    if ax is None:
+        _, ax = plt.subplots(figsize=(10, 6))
+
+    y_expr: pl.Expr = pl.col(y)
+    if residuals and model is not None:
+        slope, intercept = linear_coefficients(model)
+        y_expr = pl.col(y) - (pl.col(x) * slope + intercept)
+    y_label = f"{y} residual" if residuals else y
+
+    grid = bin_xy(
+        lf, x, y_expr, bins=bins * HEXBIN_OVERSAMPLE if kind == "hexbin" else bins
+    )
+    ax.set_xlabel(x)
+    ax.set_ylabel(y_label)
+    if not grid.counts.any():
+        print("No rows with finite x and y values to plot.")
+        return ax
+
+    image: ScalarMappable
+    if kind == "hexbin":
+        xx, yy = np.meshgrid(grid.x_centres, grid.y_centres)
+        filled = grid.counts > 0
+        image = ax.hexbin(
+            xx[filled],
+            yy[filled],
+            C=grid.counts[filled],
+            reduce_C_function=np.sum,
+            gridsize=bins,
+            bins="log",
+            mincnt=1,
+        )
+    else:
+        masked = np.ma.masked_equal(grid.counts, 0)
+        image = ax.pcolormesh(grid.x_edges, grid.y_edges, masked, norm="log")
+    ax.figure.colorbar(image, ax=ax, label="Rows")
+
+    if model is not None:
+        x_line = grid.x_edges[[0, -1]]
+        if residuals:
+            ax.plot(x_line, [0, 0], color="red", linewidth=2, label="Zero residual")
+        else:
+            slope, intercept = linear_coefficients(model)
+            y_line = x_line * slope + intercept
+            ax.plot(x_line, y_line, color="red", linewidth=2, label="Regression Line")
+
+    if sample_size:
+        points = lf.with_columns(y_expr.alias("__y")).filter(
+            pl.col(x).cast(pl.Float64).is_finite()
+            & pl.col("__y").cast(pl.Float64).is_finite()
+        )
+        sample = stratified_points(
+            points,
+            [x, "__y"],
+            sample_size,
+            stratify_by=stratify_by,
+            seed=seed,
+        )
+        ax.scatter(sample[x], sample["__y"], s=6, color="black", alpha=0.6)
+
+    ax.grid(True, linestyle=":", alpha=0.7)
+    if model is not None:
+        ax.legend()
+    return ax
+
+
+def _as_expr(column: Union[str, pl.Expr]) -> pl.Expr:
+    return pl.col(column) if isinstance(column, str) else column
+
+
+def _widen(low: Optional[float], high: Optional[float]) -> Tuple[float, float]:
+    if low is None or high is None:
+        return 0.0, 1.0
+    if low == high:
+        return low - 0.5, high + 0.5
+    return low, high
+
+
+def _bin_index(column: str, value_range: Tuple[float, float], n: int) -> pl.Expr:
+    low, high = value_range
+    index = ((pl.col(column) - low) / (high - low) * n).floor().cast(pl.Int64)
+    in_range = (pl.col(column) >= low) & (pl.col(column) <= high)
+    return pl.when(in_range).then(index.clip(0, n - 1))
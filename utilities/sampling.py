@@ -0,0 +1,162 @@
+import math
+from typing import List, Optional, Tuple, Union
+
+import polars as pl
+
+_ROW = "__sample_row"
+_KEY = "__sample_key"
+
+
+def bernoulli_sample(
+    lf: pl.LazyFrame,
+    fraction: float,
+    seed: int = 0,
+    key: Optional[Union[str, List[str]]] = None,
+) -> pl.LazyFrame:
+    """
+    Keeps each row independently with probability ``fraction``.
+
+    Rows are kept when a seeded hash of the row falls below the fraction, so the
+    sample is a lazy filter that streams in one pass and is reproducible.
+
+    Args:
+        lf (pl.LazyFrame): The data to sample.
+        fraction (float): The probability of keeping each row.
+        seed (int): The hash seed.
+        key (Optional[Union[str, List[str]]]): Columns identifying a row, e.g. a
+            location id. Rows sharing a key are kept or dropped together, and the
+            sample no longer depends on row order. Defaults to the row position.
+
+    Returns:
+        pl.LazyFrame: The sampled rows, in their original order.
+    """
+    _check_fraction(fraction)
+    columns = lf.collect_schema().names()
+    return (
+        _with_sample_key(lf, seed, key).filter(pl.col(_KEY) < fraction).select(columns)
+    )
+
+
+def reservoir_sample(
+    lf: pl.LazyFrame,
+    n: int,
+    seed: int = 0,
+    key: Optional[Union[str, List[str]]] = None,
+) -> pl.LazyFrame:
+    """
+    Takes a fixed-size uniform sample of ``n`` rows in one pass.
+
+    Equivalent to reservoir sampling: every row gets a seeded random priority
+    and the ``n`` lowest are kept with a streaming top-k, so memory stays
+    proportional to ``n`` rather than to the data.
+
+    Args:
+        lf (pl.LazyFrame): The data to sample.
+        n (int): The number of rows to keep.
+        seed (int): The hash seed.
+        key (Optional[Union[str, List[str]]]): Columns identifying a row, see
+            ``bernoulli_sample``.
+
+    Returns:
+        pl.LazyFrame: At most ``n`` sampled rows.
+    """
+    columns = lf.collect_schema().names()
+    return _with_sample_key(lf, seed, key).bottom_k(n, by=_KEY).select(columns)
+
+
+def stratified_sample(
+    lf: pl.LazyFrame,
+    by: Union[str, List[str]],
+    n: Optional[int] = None,
+    fraction: Optional[float] = None,
+    seed: int = 0,
+    key: Optional[Union[str, List[str]]] = None,
+) -> pl.LazyFrame:
+    """
+    Samples within each stratum, e.g. each ``careHome`` or ``import_date`` value.
+
+    With ``n`` every stratum contributes up to ``n`` rows, using a per-group
+    top-k. With ``fraction`` every stratum contributes ``ceil(fraction * size)``
+    rows, so small strata are never lost to chance.
+
+    Args:
+        lf (pl.LazyFrame): The data to sample.
+        by (Union[str, List[str]]): The column(s) defining the strata.
+        n (Optional[int]): The number of rows per stratum.
+        fraction (Optional[float]): The fraction of rows per stratum.
+        seed (int): The hash seed.
+        key (Optional[Union[str, List[str]]]): Columns identifying a row, see
+            ``bernoulli_sample``.
+
+    Returns:
+        pl.LazyFrame: The sampled rows, ordered by stratum.
+
+    Raises:
+        ValueError: If not exactly one of ``n`` and ``fraction`` is given.
+    """
+    if (n is None) == (fraction is None):
+        raise ValueError("Pass exactly one of `n` or `fraction`.")
+    strata = [by] if isinstance(by, str) else list(by)
+    columns = lf.collect_schema().names()
+    keyed = _with_sample_key(lf, seed, key)
+
+    if n is not None:
+        others = [c for c in keyed.collect_schema().names() if c not in strata]
+        sampled = (
+            keyed.group_by(strata)
+            .agg(pl.col(others).bottom_k_by(_KEY, n))
+            .explode(others)
+        )
+    else:
+        _check_fraction(fraction)  # type: ignore[arg-type]
+        rank = pl.col(_KEY).rank("ordinal").over(strata)
+        quota = (pl.len().over(strata) * fraction).ceil()
+        sampled = keyed.filter(rank <= quota)
+
+    return sampled.sort(strata + [_KEY]).select(columns)
+
+
+def train_test_split(
+    lf: pl.LazyFrame,
+    test_fraction: float,
+    seed: int = 0,
+    key: Optional[Union[str, List[str]]] = None,
+) -> Tuple[pl.LazyFrame, pl.LazyFrame]:
+    """
+    Splits a frame into complementary lazy train and test sets, without the
+    collect-sample-anti-join round trip.
+
+    Args:
+        lf (pl.LazyFrame): The data to split.
+        test_fraction (float): The expected fraction of rows in the test set.
+        seed (int): The hash seed.
+        key (Optional[Union[str, List[str]]]): Columns identifying a row, see
+            ``bernoulli_sample``. Use an entity id to keep all of an entity's rows
+            on the same side of the split.
+
+    Returns:
+        Tuple[pl.LazyFrame, pl.LazyFrame]: The train and test frames.
+    """
+    _check_fraction(test_fraction)
+    columns = lf.collect_schema().names()
+    keyed = _with_sample_key(lf, seed, key)
+    train = keyed.filter(pl.col(_KEY) >= test_fraction).select(columns)
+    test = keyed.filter(pl.col(_KEY) < test_fraction).select(columns)
+    return train, test
+
+
+def _with_sample_key(
+    lf: pl.LazyFrame, seed: int, key: Optional[Union[str, List[str]]]
+) -> pl.LazyFrame:
+    """Adds a reproducible pseudo-random value in [0, 1) to every row."""
+    if key is None:
+        lf = lf.with_row_index(_ROW)
+        hashed = pl.col(_ROW).hash(seed)
+    else:
+        hashed = pl.struct(key).hash(seed)
+    return lf.with_columns((hashed.cast(pl.Float64) / 2.0**64).alias(_KEY))
+
+
+def _check_fraction(fraction: float) -> None:
+    if not 0 <= fraction <= 1 or math.isnan(fraction):
+        raise ValueError(f"Fraction must be between 0 and 1, got {fraction}.")
@@ -1,8 +1,10 @@
 import polars as pl
 import boto3
-from typing import Dict, List, Tuple
+from botocore.config import Config
+from typing import Dict, List, Optional, Tuple
 from polars import DataType
 import os
+from utilities.instrumentation import REGISTRY, instrument_client
 
 REGION = os.environ.get("AWS_REGION", "eu-west-2")
 
@@ -30,8 +32,12 @@ class GlueSchemaReader:
         # Add more mappings as needed
     }
 
-    def __init__(self, database_name: str) -> None:
-        self.glue_client = boto3.client("glue", region_name=REGION)
+    def __init__(
+        self, database_name: str, client_config: Optional[Config] = None
+    ) -> None:
+        self.glue_client = instrument_client(
+            boto3.client("glue", region_name=REGION, config=client_config)
+        )
         self.database_name = database_name
 
     def _get_glue_table_schema(self, table_name: str) -> List[Dict]:
@@ -142,9 +148,10 @@ class GlueSchemaReader:
         """
         glue_schema = self._get_glue_table_schema(table_name)
         polars_schema = {}
-        for column in glue_schema:
-            col_name = column["Name"]
-            glue_type = column["Type"]
-            polars_schema[col_name] = self.get_polars_type(glue_type)
+        with REGISTRY.timer("schema_reader.parse"):
+            for column in glue_schema:
+                col_name = column["Name"]
+                glue_type = column["Type"]
+                polars_schema[col_name] = self.get_polars_type(glue_type)
 
         return polars_schema
@@ -0,0 +1,351 @@
+import argparse
+import json
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+from sklearn.base import BaseEstimator
+
+from utilities.instrumentation import REGISTRY
+from utilities.version import ModelVersionManager
+
+LATENCY_SAMPLES = 10_000
+
+
+@dataclass
+class _PendingRequest:
+    instances: np.ndarray
+    received: float = field(default_factory=time.perf_counter)
+    future: Future = field(default_factory=Future)
+
+
+class PredictionService:
+    """
+    Serves the current model version from a ModelVersionManager, coalescing
+    concurrent requests into vectorised ``predict`` calls.
+
+    A background thread polls Parameter Store for the current version and swaps
+    the model in when it changes. Each batch reads the model once, so a swap
+    never splits a batch or drops a queued request.
+    """
+
+    def __init__(
+        self,
+        version_manager: ModelVersionManager,
+        max_batch_size: int = 256,
+        max_wait_ms: float = 5.0,
+        poll_interval: float = 30.0,
+    ) -> None:
+        self.version_manager = version_manager
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.poll_interval = poll_interval
+        self._current: Optional[Tuple[str, BaseEstimator]] = None
+        self._queue: "queue.Queue[_PendingRequest]" = queue.Queue()
+        self._stop = threading.Event()
+        # Held while enqueueing and while stopping, so no request is queued
+        # after the batch thread has drained the queue and exited.
+        self._queue_lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+        self._stats_lock = threading.Lock()
+        self._latencies: Deque[float] = deque(maxlen=LATENCY_SAMPLES)
+        self._requests = 0
+        self._batches = 0
+        self._started = time.perf_counter()
+
+    @property
+    def version(self) -> Optional[str]:
+        current = self._current
+        return current[0] if current else None
+
+    def start(self) -> "PredictionService":
+        """
+        Loads the current model and starts the batching and reload threads.
+
+        Returns:
+            PredictionService: The started service, for chaining.
+        """
+        self.reload()
+        self._stop.clear()
+        self._started = time.perf_counter()
+        self._threads = [
+            threading.Thread(target=self._batch_loop, daemon=True),
+            threading.Thread(target=self._poll_loop, daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    @property
+    def running(self) -> bool:
+        return bool(self._threads) and not self._stop.is_set()
+
+    def stop(self) -> None:
+        with self._queue_lock:
+            self._stop.set()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def reload(self) -> bool:
+        """
+        Loads the current version from Parameter Store if it has changed.
+
+        Returns:
+            bool: True if a new model was swapped in.
+        """
+        version = self.version_manager.get_current_version()
+        if version == self.version:
+            return False
+        model = self.version_manager.load_model(version)
+        self._current = (version, model)
+        print(f"Serving model version {version}")
+        return True
+
+    def predict(
+        self, instances: Any, timeout: Optional[float] = None
+    ) -> Tuple[List[float], str]:
+        """
+        Queues instances for the next batch and waits for their predictions.
+
+        Args:
+            instances (Any): A 2D array-like of feature rows.
+            timeout (Optional[float]): The maximum seconds to wait.
+
+        Returns:
+            Tuple[List[float], str]: The predictions and the version that made them.
+
+        Raises:
+            ValueError: If the rows do not match the model's number of features
+                or contain NaN or infinite values.
+            RuntimeError: If the service has not been started or has stopped.
+        """
+        rows = np.atleast_2d(np.asarray(instances, dtype=float))
+        current = self._current
+        expected = getattr(current[1], "n_features_in_", None) if current else None
+        if rows.ndim != 2 or (expected is not None and rows.shape[1] != expected):
+            raise ValueError(
+                f"Expected rows of {expected} features, got shape {rows.shape}."
+            )
+        if not np.isfinite(rows).all():
+            raise ValueError("Instances must not contain NaN or infinite values.")
+        request = _PendingRequest(rows)
+        with self._queue_lock:
+            if not self.running:
+                raise RuntimeError("The prediction service is not running.")
+            self._queue.put(request)
+        return request.future.result(timeout=timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Summarises request latency and throughput since the service started.
+
+        Returns:
+            Dict[str, Any]: The latency percentiles, throughput and counts.
+        """
+        with self._stats_lock:
+            ordered = sorted(self._latencies)
+            requests, batches = self._requests, self._batches
+        elapsed = time.perf_counter() - self._started
+
+        def percentile(q: float) -> float:
+            if not ordered:
+                return 0.0
+            return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+        return {
+            "version": self.version,
+            "requests": requests,
+            "batches": batches,
+            "mean_batch_size": requests / batches if batches else 0.0,
+            "p50_ms": percentile(0.5) * 1000,
+            "p99_ms": percentile(0.99) * 1000,
+            "throughput_rps": requests / elapsed if elapsed else 0.0,
+        }
+
+    def _next_batch(self) -> List[_PendingRequest]:
+        try:
+            first = self._queue.get(timeout=0.1)
+        except queue.Empty:
+            return []
+        batch = [first]
+        rows = len(first.instances)
+        deadline = first.received + self.max_wait
+        while rows < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                request = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(request)
+            rows += len(request.instances)
+        return batch
+
+    def _batch_loop(self) -> None:
+        while not self._stop.is_set() or not self._queue.empty():
+            batch = self._next_batch()
+            if batch:
+                self._run_batch(batch)
+
+    def _run_batch(self, batch: List[_PendingRequest]) -> None:
+        current = self._current
+        try:
+            if current is None:
+                raise RuntimeError("No model loaded.")
+            version, model = current
+            with REGISTRY.timer("serving.predict"):
+                predictions = model.predict(  # type: ignore[attr-defined]
+                    np.concatenate([r.instances for r in batch])
+                )
+        except Exception as e:
+            if current is None or len(batch) == 1:
+                for request in batch:
+                    request.future.set_exception(e)
+                return
+            # Retry each request alone, so one bad request only fails itself.
+            for request in batch:
+                self._run_batch([request])
+            return
+
+        done = time.perf_counter()
+        offset = 0
+        for request in batch:
+            n = len(request.instances)
+            request.future.set_result(
+                (predictions[offset : offset + n].tolist(), version)
+            )
+            offset += n
+        with self._stats_lock:
+            self._batches += 1
+            self._requests += len(batch)
+            self._latencies.extend(done - r.received for r in batch)
+
+    def _poll_loop(self) -> None:
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.reload()
+            except Exception as e:
+                print(f"Error reloading model, keeping version {self.version}: {e}")
+
+
+class PredictionServer:
+    """
+    Minimal HTTP front end for a PredictionService.
+
+    Endpoints:
+        POST /predict: ``{"instances": [[...], ...]}`` returns
+            ``{"predictions": [...], "version": "x.y.z"}``.
+        GET /metrics: The service latency and throughput stats.
+        GET /health: The version being served.
+    """
+
+    def __init__(
+        self, service: PredictionService, host: str = "127.0.0.1", port: int = 8080
+    ) -> None:
+        self.service = service
+        self.httpd = ThreadingHTTPServer((host, port), _handler_for(service))
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host!s}:{port}"
+
+    def start(self) -> "PredictionServer":
+        """
+        Starts the service and serves HTTP on a background thread.
+
+        Returns:
+            PredictionServer: The started server, for chaining.
+        """
+        self.service.start()
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        self.service.stop()
+
+    def serve_forever(self) -> None:
+        self.service.start()
+        try:
+            self.httpd.serve_forever()
+        finally:
+            self.service.stop()
+
+
+def _handler_for(service: PredictionService) -> type:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self) -> None:
+            if self.path != "/predict":
+                self._send(404, {"error": "Not found"})
+                return
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length))
+                predictions, version = service.predict(body["instances"])
+            except (KeyError, ValueError) as e:
+                self._send(400, {"error": str(e)})
+                return
+            except RuntimeError as e:
+                self._send(503, {"error": str(e)})
+                return
+            except Exception as e:
+                self._send(500, {"error": str(e)})
+                return
+            self._send(200, {"predictions": predictions, "version": version})
+
+        def do_GET(self) -> None:
+            if self.path == "/metrics":
+                self._send(200, service.stats())
+            elif self.path == "/health":
+                self._send(200, {"version": service.version})
+            else:
+                self._send(404, {"error": "Not found"})
+
+        def _send(self, status: int, payload: Dict[str, Any]) -> None:
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    return Handler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve a versioned model over HTTP.")
+    parser.add_argument("--bucket", required=True)
+    parser.add_argument("--prefix", required=True)
+    parser.add_argument("--param", required=True)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--max-batch-size", type=int, default=256)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    parser.add_argument("--poll-interval", type=float, default=30.0)
+    args = parser.parse_args()
+
+    prediction_service = PredictionService(
+        ModelVersionManager(args.bucket, args.prefix, args.param),
+        max_batch_size=args.max_batch_size,
+        max_wait_ms=args.max_wait_ms,
+        poll_interval=args.poll_interval,
+    )
+    PredictionServer(prediction_service, args.host, args.port).serve_forever()
@@ -0,0 +1,236 @@
+import re
+import time
+from collections import Counter
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import polars as pl
+from sklearn.base import BaseEstimator
+from sklearn.linear_model import LinearRegression
+from sklearn.metrics import r2_score
+
+from utilities.experiments import ExperimentStore, dataset_fingerprint
+from utilities.version import ChangeType, EnumChangeType, ModelVersionManager
+
+
+@dataclass
+class SegmentResult:
+    """
+    The outcome of training and publishing the model for one segment.
+
+    Attributes:
+        segment (Dict[str, Any]): The segment key values.
+        path (str): The per-segment suffix used for the S3 prefix and parameter.
+        n_rows (int): The number of training rows in the segment.
+        version (Optional[str]): The published version, if publishing succeeded.
+        metrics (Dict[str, float]): Training metrics and timings.
+        error (Optional[str]): The failure message, if the segment failed.
+        log_error (Optional[str]): The failure message, if the model was
+            published but the run could not be written to the experiment store.
+    """
+
+    segment: Dict[str, Any]
+    path: str
+    n_rows: int
+    version: Optional[str] = None
+    metrics: Dict[str, float] = field(default_factory=dict)
+    error: Optional[str] = None
+    log_error: Optional[str] = None
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None
+
+
+class SegmentTrainer:
+    """
+    Trains and publishes one model per segment of a dataset, fitting segments
+    in parallel on a process pool.
+
+    Each segment is published through its own ModelVersionManager, under
+    ``{s3_prefix}/{segment path}`` and ``{param_store_name}/{segment path}``.
+    With an experiment store, every published segment is also logged as a run
+    under ``param_store_name``, with the segment path as its segment.
+    """
+
+    def __init__(
+        self,
+        s3_bucket: str,
+        s3_prefix: str,
+        param_store_name: str,
+        model_factory: Callable[[], BaseEstimator] = LinearRegression,
+        max_workers: Optional[int] = None,
+        change_type: ChangeType = EnumChangeType.MINOR,
+        experiment_store: Optional[ExperimentStore] = None,
+    ) -> None:
+        self.s3_bucket = s3_bucket
+        self.s3_prefix = s3_prefix
+        self.param_store_name = param_store_name
+        self.model_factory = model_factory
+        self.max_workers = max_workers
+        self.change_type = change_type
+        self.experiment_store = experiment_store
+        self._fingerprint: Optional[str] = None
+
+    def version_manager(self, path: str) -> ModelVersionManager:
+        """
+        Builds the version manager for a segment.
+
+        Args:
+            path (str): The per-segment path suffix.
+
+        Returns:
+            ModelVersionManager: The manager publishing that segment's model.
+        """
+        return ModelVersionManager(
+            self.s3_bucket,
+            f"{self.s3_prefix}/{path}",
+            f"{self.param_store_name}/{path}",
+            experiment_store=self.experiment_store,
+        )
+
+    def train(
+        self,
+        lf: pl.LazyFrame,
+        segment_key: Union[str, List[str]],
+        features: List[str],
+        target: str,
+    ) -> List[SegmentResult]:
+        """
+        Partitions the data once by the segment key, fits a model per segment on
+        the process pool and publishes each one as it finishes.
+
+        A failure in one segment is recorded on its result and does not stop the
+        other segments from being trained and published. Segments whose values
+        map to the same path (e.g. "North East" and "North_East") would publish
+        over each other, so they all fail without being trained.
+
+        Args:
+            lf (pl.LazyFrame): The scanned training data.
+            segment_key (Union[str, List[str]]): The column(s) defining a segment.
+            features (List[str]): The feature columns.
+            target (str): The target column.
+
+        Returns:
+            List[SegmentResult]: One result per segment, in segment order.
+        """
+        keys = [segment_key] if isinstance(segment_key, str) else list(segment_key)
+        df = lf.select(keys + features + [target]).collect()
+        if self.experiment_store is not None:
+            self._fingerprint = dataset_fingerprint(df.lazy())
+        partitions = df.partition_by(keys, as_dict=True, maintain_order=False)
+
+        segments = [
+            (dict(zip(keys, values)), part)
+            for values, part in sorted(partitions.items(), key=lambda kv: str(kv[0]))
+        ]
+        paths = Counter(segment_path(segment) for segment, _ in segments)
+
+        results: List[SegmentResult] = []
+        with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+            futures: Dict[Future, SegmentResult] = {}
+            for segment, part in segments:
+                path = segment_path(segment)
+                result = SegmentResult(segment, path, part.height)
+                results.append(result)
+                if paths[path] > 1:
+                    result.error = (
+                        f"Segment path {path} is shared by {paths[path]} segments."
+                    )
+                    print(f"Segment {path} failed: {result.error}")
+                    continue
+                x = part.select(features).to_numpy()
+                y = part[target].to_numpy()
+                futures[pool.submit(fit_segment, self.model_factory, x, y)] = result
+
+            for future in as_completed(futures):
+                result = futures[future]
+                try:
+                    model, result.metrics = future.result()
+                    self._publish(model, result)
+                except Exception as e:
+                    result.error = f"{type(e).__name__}: {e}"
+                    print(f"Segment {result.path} failed: {result.error}")
+
+        if self.experiment_store is not None:
+            try:
+                self.experiment_store.compact(model_name=self.param_store_name)
+            except Exception as e:
+                print(f"Compacting the experiment log failed: {e!r}")
+
+        failed = [r.path for r in results if not r.succeeded]
+        print(
+            f"Trained {len(results) - len(failed)} of {len(results)} segments."
+            + (f" Failed: {', '.join(failed)}" if failed else "")
+        )
+        return results
+
+    def _publish(self, model: BaseEstimator, result: SegmentResult) -> None:
+        manager = self.version_manager(result.path)
+        version = manager.get_new_version(self.change_type)
+        manager.save_model(model, version)
+        manager.update_parameter_store(version)
+        result.version = version
+        # The model is live at this point, so failing to log the run must not
+        # mark the segment as failed.
+        try:
+            manager.record_run(
+                version,
+                metrics={k: v for k, v in result.metrics.items() if k != "fit_seconds"},
+                params=model.get_params(),
+                timings={
+                    "fit_seconds": result.metrics.get("fit_seconds", float("nan"))
+                },
+                n_train_rows=result.n_rows,
+                dataset_fingerprint=self._fingerprint,
+                segment=result.path,
+                model_name=self.param_store_name,
+            )
+        except Exception as e:
+            result.log_error = f"{type(e).__name__}: {e}"
+            print(
+                f"Segment {result.path} published as {version}, but logging "
+                f"the run failed: {result.log_error}"
+            )
+
+
+def fit_segment(
+    model_factory: Callable[[], BaseEstimator], x: np.ndarray, y: np.ndarray
+) -> Tuple[BaseEstimator, Dict[str, float]]:
+    """
+    Fits one segment's model. Runs in a worker process, so it must stay a
+    module-level function.
+
+    Args:
+        model_factory (Callable[[], BaseEstimator]): Builds an unfitted model.
+        x (np.ndarray): The feature matrix.
+        y (np.ndarray): The target vector.
+
+    Returns:
+        Tuple[BaseEstimator, Dict[str, float]]: The fitted model and its metrics.
+    """
+    start = time.perf_counter()
+    model = model_factory()
+    model.fit(x, y)  # type: ignore[attr-defined]
+    fit_seconds = time.perf_counter() - start
+    r2 = r2_score(y, model.predict(x)) if len(y) > 1 else float("nan")  # type: ignore[attr-defined]
+    return model, {"r2": float(r2), "fit_seconds": fit_seconds}
+
+
+def segment_path(segment: Dict[str, Any]) -> str:
+    """
+    Builds an S3 and Parameter Store safe path from segment key values.
+
+    Args:
+        segment (Dict[str, Any]): The segment key values.
+
+    Returns:
+        str: The path, e.g. "careHome_Y/region_North_East".
+    """
+    parts = []
+    for key, value in segment.items():
+        text = "null" if value is None else str(value)
+        parts.append(re.sub(r"[^A-Za-z0-9_.-]", "_", f"{key}_{text}"))
+    return "/".join(parts)
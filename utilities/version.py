@@ -1,15 +1,21 @@
 from enum import Enum
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
 from sklearn.base import BaseEstimator
 import pickle
 import io
 import json
-from typing import Literal
+import re
+from typing import Any, Dict, List, Literal, Optional
 import os
+from utilities.experiments import ExperimentStore, RunRecord
+from utilities.instrumentation import REGISTRY, instrument_client
 
 
 REGION = os.environ.get("AWS_REGION", "eu-west-2")
+MODEL_FILENAME = "model.pkl"
+VERSION_PATTERN = re.compile(r"^\d+\.\d+\.\d+$")
 
 
 class EnumChangeType(Enum):
@@ -27,12 +33,24 @@ class ModelVersionManager:
     Parameter Store.
     """
 
-    def __init__(self, s3_bucket, s3_prefix, param_store_name):
+    def __init__(
+        self,
+        s3_bucket,
+        s3_prefix,
+        param_store_name,
+        client_config: Optional[Config] = None,
+        experiment_store: Optional[ExperimentStore] = None,
+    ):
         self.s3_bucket = s3_bucket
         self.s3_prefix = s3_prefix
-        self.ssm_client = boto3.client("ssm", region_name=REGION)
-        self.s3_client = boto3.client("s3", region_name=REGION)
+        self.ssm_client = instrument_client(
+            boto3.client("ssm", region_name=REGION, config=client_config)
+        )
+        self.s3_client = instrument_client(
+            boto3.client("s3", region_name=REGION, config=client_config)
+        )
         self.param_store_name = param_store_name
+        self.experiment_store = experiment_store
 
     def get_current_version(self) -> str:
         """
@@ -48,7 +66,8 @@ class ModelVersionManager:
             response = self.ssm_client.get_parameter(
                 Name=self.param_store_name, WithDecryption=False
             )
-            raw_value = json.loads(response["Parameter"]["Value"])
+            with REGISTRY.timer("version.parse_parameter"):
+                raw_value = json.loads(response["Parameter"]["Value"])
             return raw_value["Current Version"]
         except ClientError as e:
             print(f"Boto3 Error while retrieving parameter: {e}")
@@ -145,15 +164,134 @@ class ModelVersionManager:
             model(BaseEstimator): The trained model object to be saved.
             new_version (str): The new version string.
         """
-        prefix = f"{self.s3_prefix}/{new_version}/model.pkl"
+        prefix = f"{self.s3_prefix}/{new_version}/{MODEL_FILENAME}"
         buffer = io.BytesIO()
-        pickle.dump(model, buffer)
+        with REGISTRY.timer("version.pickle"):
+            pickle.dump(model, buffer)
         buffer.seek(0)
 
         self.s3_client.upload_fileobj(buffer, self.s3_bucket, prefix)
 
         print(f"Saving model to s3://{self.s3_bucket}/{prefix}")
 
+    def save_artifact(self, data: bytes, version: str, filename: str) -> str:
+        """
+        Saves an auxiliary artifact alongside the model for a given version.
+
+        Args:
+            data (bytes): The serialised artifact.
+            version (str): The model version the artifact belongs to.
+            filename (str): The file name to use under the version prefix.
+
+        Returns:
+            str: The S3 key the artifact was written to.
+        """
+        key = f"{self.s3_prefix}/{version}/{filename}"
+        self.s3_client.upload_fileobj(io.BytesIO(data), self.s3_bucket, key)
+        print(f"Saving artifact to s3://{self.s3_bucket}/{key}")
+        return key
+
+    def load_artifact(self, version: str, filename: str) -> bytes:
+        """
+        Loads an auxiliary artifact stored alongside the model for a given version.
+
+        Args:
+            version (str): The model version the artifact belongs to.
+            filename (str): The file name under the version prefix.
+
+        Returns:
+            bytes: The raw artifact contents.
+        """
+        key = f"{self.s3_prefix}/{version}/{filename}"
+        buffer = io.BytesIO()
+        self.s3_client.download_fileobj(self.s3_bucket, key, buffer)
+        return buffer.getvalue()
+
+    def load_model(self, version: Optional[str] = None) -> BaseEstimator:
+        """
+        Loads a trained model from S3.
+
+        Args:
+            version (Optional[str]): The version to load, defaults to the current
+                version in Parameter Store.
+
+        Returns:
+            BaseEstimator: The unpickled model.
+        """
+        if version is None:
+            version = self.get_current_version()
+        data = self.load_artifact(version, MODEL_FILENAME)
+        print(f"Loaded model from s3://{self.s3_bucket}/{self.s3_prefix}/{version}")
+        with REGISTRY.timer("version.unpickle"):
+            model = pickle.loads(data)  # nosec B301
+        return model
+
+    def list_versions(self) -> List[str]:
+        """
+        Lists the versions saved under the S3 prefix, oldest first.
+
+        Returns:
+            List[str]: The version strings in semantic version order.
+        """
+        paginator = self.s3_client.get_paginator("list_objects_v2")
+        versions = []
+        for page in paginator.paginate(
+            Bucket=self.s3_bucket, Prefix=f"{self.s3_prefix}/", Delimiter="/"
+        ):
+            for common_prefix in page.get("CommonPrefixes", []):
+                version = common_prefix["Prefix"].rstrip("/").rsplit("/", 1)[-1]
+                if VERSION_PATTERN.match(version):
+                    versions.append(version)
+        return sorted(versions, key=lambda v: [int(p) for p in v.split(".")])
+
+    def record_run(
+        self,
+        version: str,
+        metrics: Dict[str, float],
+        params: Optional[Dict[str, Any]] = None,
+        timings: Optional[Dict[str, float]] = None,
+        n_train_rows: Optional[int] = None,
+        n_test_rows: Optional[int] = None,
+        dataset_fingerprint: Optional[str] = None,
+        segment: Optional[str] = None,
+        model_name: Optional[str] = None,
+    ) -> Optional[str]:
+        """
+        Records a training run of this model in the experiment store, if one is
+        configured.
+
+        Args:
+            version (str): The version the run was saved as.
+            metrics (Dict[str, float]): Evaluation metrics, e.g. ``{"r2": 0.93}``.
+            params (Optional[Dict[str, Any]]): Training parameters.
+            timings (Optional[Dict[str, float]]): Phase durations in seconds.
+            n_train_rows (Optional[int]): The number of training rows.
+            n_test_rows (Optional[int]): The number of evaluation rows.
+            dataset_fingerprint (Optional[str]): A fingerprint of the training data.
+            segment (Optional[str]): The segment path, for per-segment models.
+            model_name (Optional[str]): The name to log the run under, defaults to
+                the Parameter Store name.
+
+        Returns:
+            Optional[str]: The path the run was written to, or None without a store.
+        """
+        if self.experiment_store is None:
+            return None
+        return self.experiment_store.record(
+            RunRecord(
+                model_name=model_name or self.param_store_name,
+                version=version,
+                metrics=metrics,
+                params=params or {},
+                timings=timings or {},
+                n_train_rows=n_train_rows,
+                n_test_rows=n_test_rows,
+                dataset_fingerprint=dataset_fingerprint,
+                segment=segment,
+                artifact_key=f"{self.s3_prefix}/{version}/{MODEL_FILENAME}",
+            )
+        )
+
     def prompt_change(self, prompt_num=0) -> ChangeType:
         """Prompts user for input to give version."""
         selection = input(
@@ -176,12 +314,27 @@ class ModelVersionManager:
             case _:
                 raise ValueError("Invalid change type.")
 
-    def prompt_and_save(self, model: BaseEstimator) -> None:
+    def prompt_and_save(
+        self,
+        model: BaseEstimator,
+        metrics: Optional[Dict[str, float]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        n_train_rows: Optional[int] = None,
+        n_test_rows: Optional[int] = None,
+    ) -> None:
         """
         Prompts the user for a change type and handles the versioning and saving process.
 
+        If an experiment store is configured, the run is then recorded in it. The
+        model is already live at that point, so a logging failure is only printed.
+
         Args:
             model (BaseEstimator): The trained model object.
+            metrics (Optional[Dict[str, float]]): Evaluation metrics to record.
+            params (Optional[Dict[str, Any]]): Training parameters to record,
+                defaults to the model's ``get_params()``.
+            n_train_rows (Optional[int]): The number of training rows.
+            n_test_rows (Optional[int]): The number of evaluation rows.
         """
         should_save = input(
             "Do you want to save this new model version? (only yes to save): "
@@ -195,3 +348,15 @@ class ModelVersionManager:
         new_version = self.get_new_version(change_type)
         self.save_model(model, new_version)
         self.update_parameter_store(new_version)
+        if params is None and hasattr(model, "get_params"):
+            params = model.get_params()
+        try:
+            self.record_run(
+                new_version,
+                metrics or {},
+                params=params,
+                n_train_rows=n_train_rows,
+                n_test_rows=n_test_rows,
+            )
+        except Exception as e:
+            print(f"Saved {new_version}, but logging the run failed: {e!r}")